@@ -0,0 +1,64 @@
+"""
+Arduino stand-in on a pseudo-terminal, for running without the hardware.
+
+Prints the device to use as the serial port ("arduino_port" in
+settings.json), sends PERSON_DETECTED every --every seconds and any line
+typed on stdin (SCAN, CLEAR, ...), and prints the commands it receives,
+like the door's OPEN|name|id|seconds.
+
+    python arduino_sim.py --every 10
+
+POSIX only. On Windows, set "arduino_port" to "loop://": pyserial's
+loopback port echoes every command back, and events can be injected with
+serial_link.get_link().send("SCAN").
+"""
+import argparse
+import os
+import select
+import sys
+import time
+import tty
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--every", type=float, default=0, help="seconds between PERSON_DETECTED (0 = never)")
+    args = parser.parse_args()
+
+    master, slave = os.openpty()
+    # Raw mode: no echo of the commands back to the link, no newline translation
+    tty.setraw(slave)
+    print(f"[INFO] Arduino stand-in on {os.ttyname(slave)}; type SCAN / CLEAR / PERSON_DETECTED")
+    sys.stdout.flush()
+
+    next_trigger = time.monotonic() + args.every if args.every else None
+    pending = b""
+    try:
+        while True:
+            timeout = None if next_trigger is None else max(0.0, next_trigger - time.monotonic())
+            readable, _, _ = select.select([master, sys.stdin], [], [], timeout)
+            if master in readable:
+                pending += os.read(master, 1024)
+                while b"\n" in pending:
+                    line, pending = pending.split(b"\n", 1)
+                    print(f"[ARDUINO] Received: {line.decode(errors='replace').strip()}")
+            if sys.stdin in readable:
+                line = sys.stdin.readline()
+                if not line:
+                    break
+                if line.strip():
+                    os.write(master, line.strip().encode() + b"\n")
+            if next_trigger is not None and time.monotonic() >= next_trigger:
+                os.write(master, b"PERSON_DETECTED\n")
+                print("[ARDUINO] Sent: PERSON_DETECTED")
+                next_trigger += args.every
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+if __name__ == "__main__":
+    main()
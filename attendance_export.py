@@ -0,0 +1,104 @@
+import csv
+import os
+import sqlite3
+from attendance_query import COLUMNS, count_records
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# --------------------- CONFIG ---------------------
+DB_FILE = "attendance.db"
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_HEADER = ["ID", "Name", "Student ID", "Department", "Date", "Time", "Status"]
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def parquet_available():
+    return pq is not None
+
+
+# -----------------------------
+# Streaming
+# -----------------------------
+def iter_chunks(cursor, where="1=1", params=(), chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield lists of at most `chunk_rows` rows; never holds the whole result."""
+    cursor.execute(f"SELECT {COLUMNS} FROM attendance_records WHERE {where}", list(params))
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            return
+        yield rows
+
+
+def write_csv(path, chunks, on_chunk):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADER)
+        for rows in chunks:
+            writer.writerows(rows)
+            on_chunk(len(rows))
+
+
+def write_parquet(path, chunks, on_chunk):
+    if pq is None:
+        raise RuntimeError("Parquet export needs the 'pyarrow' package.")
+    schema = pa.schema([("id", pa.int64())] + [
+        (name.strip(), pa.string()) for name in COLUMNS.split(",")[1:]
+    ])
+    # One row group per chunk keeps the writer's buffer bounded
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema))
+            on_chunk(len(rows))
+
+
+# -----------------------------
+# Export Entry Point
+# -----------------------------
+def export_attendance(path, where="1=1", params=(), fmt=None, progress=None,
+                      cancel=None, db_file=DB_FILE, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Stream the rows matching `where` to a CSV or Parquet file.
+
+    `fmt` defaults to the file extension. `progress(done, total)` is called
+    after every chunk and `cancel` is an optional threading.Event. Output is
+    written to a temporary file and renamed at the end, so a cancelled or
+    failed export never leaves a truncated file behind.
+    Returns the number of rows written.
+    """
+    fmt = fmt or ("parquet" if path.lower().endswith(".parquet") else "csv")
+    writer = write_parquet if fmt == "parquet" else write_csv
+
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    total = count_records(cursor, where, params)
+    done = 0
+
+    def on_chunk(n):
+        nonlocal done
+        done += n
+        if progress:
+            progress(done, total)
+        if cancel is not None and cancel.is_set():
+            raise ExportCancelled()
+
+    tmp_path = path + ".part"
+    try:
+        writer(tmp_path, iter_chunks(cursor, where, params, chunk_rows), on_chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        conn.close()
+    return done
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+# --------------------- CONFIG ---------------------
+PAGE_SIZE = 100
+COLUMNS = "id, name, student_id, department, date, time, status"
+
+
+# -----------------------------
+# Filter -> WHERE clause
+# -----------------------------
+def fts_enabled(cursor):
+    """True when the attendance_fts index was created by init_db()."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='attendance_fts'")
+    return cursor.fetchone() is not None
+
+
+def fts_match_query(**columns):
+    """
+    Build an FTS5 MATCH expression that prefix-matches every word typed into
+    each column filter, e.g. department="comp sci" -> department:"comp"* AND ...
+    """
+    terms = []
+    for column, text in columns.items():
+        for word in text.split():
+            word = word.replace('"', '""')
+            terms.append(f'{column} : "{word}"*')
+    return " AND ".join(terms)
+
+
+def build_filter(today_only=False, department="", status="All", name="", use_fts=False):
+    """
+    Return (where_sql, params) for the attendance viewer filters.
+
+    Department and name filters match word prefixes through the FTS5 index
+    when `use_fts` is set, and whole-value prefixes (served by the NOCASE
+    indexes) otherwise, so neither path scans the whole table.
+    """
+    query = "1=1"
+    params = []
+    if today_only:
+        query += " AND date=?"
+        params.append(datetime.now().strftime("%Y-%m-%d"))
+    if use_fts and (department or name):
+        text_filters = {}
+        if department:
+            text_filters["department"] = department
+        if name:
+            text_filters["name"] = name
+        query += " AND id IN (SELECT rowid FROM attendance_fts WHERE attendance_fts MATCH ?)"
+        params.append(fts_match_query(**text_filters))
+    else:
+        if department:
+            query += " AND department LIKE ? ESCAPE '\\'"
+            params.append(escape_like(department) + "%")
+        if name:
+            query += " AND name LIKE ? ESCAPE '\\'"
+            params.append(escape_like(name) + "%")
+    if status != "All":
+        query += " AND status=?"
+        params.append(status)
+    return query, params
+
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def count_records(cursor, where="1=1", params=()):
+    cursor.execute(f"SELECT COUNT(*) FROM attendance_records WHERE {where}", list(params))
+    return cursor.fetchone()[0]
+
+
+# -----------------------------
+# Keyset pagination
+# -----------------------------
+def row_key(row):
+    """Keyset cursor (date, time, id) of a row in COLUMNS order."""
+    return row[4], row[5], int(row[0])
+
+
+def fetch_page(cursor, where="1=1", params=(), after=None, before=None, limit=PAGE_SIZE):
+    """
+    Fetch one page ordered by date DESC, time DESC, id DESC.
+
+    `after` is the key of the last row already shown (next page), `before`
+    the key of the first row shown (previous page). Seeking on the key
+    instead of OFFSET keeps every page an index range scan.
+    """
+    params = list(params)
+    if before is not None:
+        cursor.execute(f'''
+            SELECT {COLUMNS} FROM attendance_records
+            WHERE {where} AND (date, time, id) > (?, ?, ?)
+            ORDER BY date ASC, time ASC, id ASC
+            LIMIT ?
+        ''', params + list(before) + [limit])
+        return cursor.fetchall()[::-1]
+
+    if after is not None:
+        where += " AND (date, time, id) < (?, ?, ?)"
+        params += list(after)
+    cursor.execute(f'''
+        SELECT {COLUMNS} FROM attendance_records
+        WHERE {where}
+        ORDER BY date DESC, time DESC, id DESC
+        LIMIT ?
+    ''', params + [limit])
+    return cursor.fetchall()
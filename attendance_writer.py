@@ -0,0 +1,112 @@
+import atexit
+import sqlite3
+import threading
+from datetime import datetime
+from check_attendance import DB_FILE, init_db, write_attendance_records
+
+# --------------------- CONFIG ---------------------
+FLUSH_INTERVAL_MS = 500
+FLUSH_MAX_EVENTS = 50
+
+
+class AttendanceWriter:
+    """
+    Background writer for attendance events.
+
+    `submit()` only records the event in memory and returns immediately.
+    Events are coalesced per (student_id, date), keeping the latest sighting,
+    and a writer thread flushes them in a single transaction every
+    `flush_interval_ms` or once `flush_max_events` events are waiting.
+    """
+
+    def __init__(self, db_file=DB_FILE, flush_interval_ms=FLUSH_INTERVAL_MS,
+                 flush_max_events=FLUSH_MAX_EVENTS):
+        self.db_file = db_file
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_events = flush_max_events
+        self.events = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+        self._pending = {}
+        self._pending_events = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    # ---------------- Producer side ----------------
+    def submit(self, name, student_id, department, status="Present"):
+        now = datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
+        time_str = now.strftime("%H:%M:%S")
+        record = (name, str(student_id), department, date_str, time_str, status)
+
+        with self._cond:
+            self._pending[(record[1], date_str)] = record
+            self._pending_events += 1
+            self.events += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="attendance-writer", daemon=True)
+                self._thread.start()
+            if self._pending_events >= self.flush_max_events:
+                self._cond.notify()
+
+    def flush(self):
+        """Write everything pending on the calling thread."""
+        with self._cond:
+            batch = self._take_batch()
+        self._write(batch)
+
+    def close(self):
+        """Stop the writer thread after a final flush."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            thread = self._thread
+        if thread:
+            thread.join(timeout=5)
+        self.flush()
+
+    # ---------------- Writer thread ----------------
+    def _take_batch(self):
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self._pending_events = 0
+        return batch
+
+    def _run(self):
+        init_db()
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or self._pending_events >= self.flush_max_events,
+                    self.flush_interval)
+                batch = self._take_batch()
+                stopping = self._stopping
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            conn = sqlite3.connect(self.db_file)
+            cursor = conn.cursor()
+            with conn:
+                write_attendance_records(cursor, batch)
+            conn.close()
+            self.flushes += 1
+            self.rows_written += len(batch)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Could not write attendance batch: {e}")
+            # Put the batch back unless a newer sighting replaced it meanwhile
+            with self._cond:
+                for record in batch:
+                    self._pending.setdefault((record[1], record[3]), record)
+
+
+# Shared writer for every recognition window in this process
+attendance_writer = AttendanceWriter()
+atexit.register(attendance_writer.close)
@@ -0,0 +1,121 @@
+"""
+Face detection ms/frame and recall for each detection width and size limit.
+
+Runs face_detector.FaceDetector over a recorded clip at several detection
+widths, with and without the door-distance minSize/maxSize limits.
+Recall is measured against full-resolution, unlimited detection (the old
+behaviour) on the same frames, matching boxes at IoU >= 0.5. Without
+--clip, a synthetic clip of drawn faces at varying distances is used and
+recall is measured against the known face positions instead.
+
+    python -m benchmarks.bench_detection --clip door.mp4 --frames 300
+    python -m benchmarks.bench_detection --widths 0 480 320 240
+"""
+import argparse
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from face_detector import FaceDetector
+from face_tracking import iou
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_clip(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        gray = cv2.cvtColor(cv2.resize(frame, (640, 480)), cv2.COLOR_BGR2GRAY)
+        frames.append(cv2.equalizeHist(gray))
+    cap.release()
+    return frames
+
+
+def draw_face(size, rng):
+    """A simple frontal face drawing the Haar cascade accepts."""
+    s = size / 160
+    img = np.full((size, size), 90, np.uint8)
+    c = size // 2
+    cv2.ellipse(img, (c, int(c + 5 * s)), (int(55 * s), int(72 * s)), 0, 0, 360, 200, -1)
+    for side in (-1, 1):
+        ex, ey = int(c + side * 25 * s), int(c - 12 * s)
+        cv2.ellipse(img, (ex, int(ey - 14 * s)), (int(16 * s), int(5 * s)), 0, 180, 360, 60, -1)
+        cv2.ellipse(img, (ex, ey), (int(13 * s), int(7 * s)), 0, 0, 360, 70, -1)
+        cv2.circle(img, (ex, ey), int(5 * s), 30, -1)
+    cv2.line(img, (c, int(c - 5 * s)), (c, int(c + 18 * s)), 150, max(1, int(6 * s)))
+    cv2.ellipse(img, (c, int(c + 38 * s)), (int(22 * s), int(7 * s)), 0, 0, 360, 80, -1)
+    img = cv2.GaussianBlur(img, (0, 0), 2 * s)
+    return np.clip(img + rng.normal(0, 4, img.shape), 0, 255).astype(np.uint8)
+
+
+def synthetic_clip(count, rng):
+    """Frames with two people walking towards the door, plus their true boxes."""
+    background = cv2.imread(os.path.join(ROOT, "background2.jpg"), cv2.IMREAD_GRAYSCALE)
+    if background is None:
+        background = rng.integers(60, 180, (480, 640), dtype=np.uint8)
+    background = cv2.resize(background, (640, 480))
+    frames, truth = [], []
+    for t in range(count):
+        img = background.copy()
+        boxes = []
+        for person in range(2):
+            # Face size grows from ~50px (far) to ~220px (at the door)
+            phase = ((t + person * count // 2) % count) / count
+            size = int(50 + 170 * phase)
+            x = int(60 + person * 300 + 40 * np.sin(t / 15 + person))
+            y = int(240 - size / 2)
+            x = min(x, 640 - size)
+            img[y:y + size, x:x + size] = draw_face(size, rng)
+            boxes.append((x, y, size, size))
+        frames.append(cv2.equalizeHist(img))
+        truth.append(boxes)
+    return frames, truth
+
+
+def recall(found, truth):
+    hits = sum(any(iou(box, f) >= 0.5 for f in faces) for faces, boxes in zip(found, truth) for box in boxes)
+    total = sum(len(boxes) for boxes in truth)
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clip", help="video file recorded at the door")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--widths", type=int, nargs="+", default=[0, 480, 320, 240],
+                        help="detection widths (0 = full resolution)")
+    args = parser.parse_args()
+
+    if args.clip:
+        frames = read_clip(args.clip, args.frames)
+        if not frames:
+            sys.exit(f"Could not read frames from {args.clip}")
+        reference = FaceDetector(width=0, near=None, far=None)
+        truth = [reference.detect(frame) for frame in frames]
+        print(f"{len(frames)} frames from {args.clip}, recall vs full-resolution detection\n")
+    else:
+        frames, truth = synthetic_clip(args.frames, np.random.default_rng(0))
+        print(f"{len(frames)} synthetic frames, recall vs true face positions\n")
+
+    print(f"{'width':>6} {'size limits':>12} {'ms/frame':>9} {'recall':>7} {'boxes':>6}")
+    for width in args.widths:
+        for limited in (False, True):
+            detector = (FaceDetector(width=width) if limited else
+                        FaceDetector(width=width, near=None, far=None))
+            start = time.perf_counter()
+            found = [detector.detect(frame) for frame in frames]
+            ms = (time.perf_counter() - start) / len(frames) * 1000
+            print(f"{width or 'full':>6} {'door' if limited else 'none':>12} {ms:>9.1f} "
+                  f"{recall(found, truth):>7.1%} {sum(map(len, found)):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory benchmark for the streaming attendance exporter.
+
+Builds a synthetic attendance database and exports it at several sizes,
+reporting wall time and peak Python heap (tracemalloc) for the streaming
+exporter next to the old fetchall() approach. The streaming peak should
+stay flat as the row count grows.
+
+    python -m benchmarks.bench_export --rows 5000000
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_export import export_attendance, parquet_available
+
+
+def build_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE attendance_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            student_id TEXT,
+            department TEXT,
+            date TEXT,
+            time TEXT,
+            status TEXT
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO attendance_records (name, student_id, department, date, time, status) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"Student {i % 1000}", str(i % 1000), ("CSE", "EEE", "BBA")[i % 3],
+          f"2025-{1 + i // 28000 % 12:02d}-{1 + i // 1000 % 28:02d}", "09:00:00",
+          "Present" if i % 7 else "Absent") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def fetchall_export(db_file, path):
+    conn = sqlite3.connect(db_file)
+    rows = conn.execute("SELECT * FROM attendance_records LIMIT -1").fetchall()
+    conn.close()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return len(rows)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--skip-fetchall", action="store_true",
+                        help="skip the fetchall() baseline (it needs several GB at 5M rows)")
+    args = parser.parse_args()
+
+    sizes = sorted({max(1, args.rows // 10), max(1, args.rows // 2), args.rows})
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>10} {'method':<16} {'seconds':>8} {'peak MB':>8}")
+        for size in sizes:
+            db_file = os.path.join(tmp, f"attendance_{size}.db")
+            build_db(db_file, size)
+
+            methods = [("stream csv", lambda: export_attendance(
+                os.path.join(tmp, "out.csv"), db_file=db_file))]
+            if parquet_available():
+                methods.append(("stream parquet", lambda: export_attendance(
+                    os.path.join(tmp, "out.parquet"), db_file=db_file)))
+            if not args.skip_fetchall:
+                methods.append(("fetchall csv", lambda: fetchall_export(
+                    db_file, os.path.join(tmp, "old.csv"))))
+
+            for label, fn in methods:
+                rows, elapsed, peak = measure(fn)
+                print(f"{rows:>10} {label:<16} {elapsed:>8.2f} {peak:>8.1f}")
+            os.remove(db_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Enroll-one-student latency: incremental LBPH update vs full retrain.
+
+For each enrollment size, trains a model on synthetic 200x200 faces, then
+times adding one more student both ways. Totals include reading and
+writing trainer.yml as train_model() does; the compute-only columns show
+train() against update() alone, since YAML I/O dominates at scale.
+
+    python -m benchmarks.bench_incremental --profiles 100 500 1000 --samples 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from training_data import FACE_SIZE
+
+
+def synthetic_faces(label, samples, rng):
+    # A per-student base texture plus per-frame noise, like repeated captures
+    base = rng.integers(0, 256, FACE_SIZE, dtype=np.uint8)
+    noise = rng.integers(-20, 21, (samples,) + FACE_SIZE)
+    return [np.clip(base + n, 0, 255).astype(np.uint8) for n in noise]
+
+
+def new_recognizer():
+    return cv2.face.LBPHFaceRecognizer_create(radius=1, neighbors=8, grid_x=8, grid_y=8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--samples", type=int, default=10, help="images per student")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'profiles':>8} {'samples':>8} {'full total s':>13} {'incr total s':>13} "
+          f"{'train() s':>10} {'update() s':>11} {'yml read s':>11} {'yml save s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_file = os.path.join(tmp, "trainer.yml")
+        for profiles in args.profiles:
+            faces, ids = [], []
+            for label in range(profiles):
+                faces += synthetic_faces(label, args.samples, rng)
+                ids += [label] * args.samples
+            recognizer = new_recognizer()
+            recognizer.train(faces, np.array(ids))
+            recognizer.save(model_file)
+
+            new_faces = synthetic_faces(profiles, args.samples, rng)
+            new_ids = np.array([profiles] * args.samples)
+
+            start = time.perf_counter()
+            recognizer = new_recognizer()
+            recognizer.train(faces + new_faces, np.concatenate([ids, new_ids]))
+            train_s = time.perf_counter() - start
+            recognizer.save(model_file)
+            full = time.perf_counter() - start
+
+            start = time.perf_counter()
+            recognizer = new_recognizer()
+            recognizer.read(model_file)
+            read_s = time.perf_counter() - start
+            recognizer.update(new_faces, new_ids)
+            update_s = time.perf_counter() - start - read_s
+            recognizer.save(model_file)
+            incremental = time.perf_counter() - start
+            save_s = incremental - read_s - update_s
+
+            print(f"{profiles:>8} {len(faces) + len(new_faces):>8} {full:>13.2f} {incremental:>13.2f} "
+                  f"{train_s:>10.2f} {update_s:>11.3f} {read_s:>11.2f} {save_s:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Predictions per second: OpenCV LBPH predict() vs the NumPy engine.
+
+Trains a cv2.face LBPH model on synthetic 200x200 faces for each
+enrollment size, then times single-face predict() calls against
+lbph_engine.predict_batch() on frames of several faces, and checks that
+both return the same labels.
+
+    python -m benchmarks.bench_lbph_engine --students 10 50 100 200 --samples 20
+"""
+import argparse
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lbph_engine import LBPHEngine
+
+
+def synthetic_face(rng):
+    """Smooth random shading, so different people share most LBP structure."""
+    img = cv2.GaussianBlur(rng.random((200, 200), dtype=np.float32), (0, 0), 6)
+    return cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+
+
+def sample(base, rng, spread=6):
+    """A slightly shifted, noisy capture run through the training preprocessing."""
+    dx, dy = rng.integers(-3, 4, 2)
+    img = np.roll(base, (dy, dx), axis=(0, 1)).astype(np.int16)
+    img = np.clip(img + rng.integers(-spread, spread + 1, img.shape), 0, 255).astype(np.uint8)
+    return cv2.GaussianBlur(cv2.equalizeHist(img), (3, 3), 0)
+
+
+def rate(fn, faces, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(faces)
+    return repeat * len(faces) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--samples", type=int, default=20, help="training images per student")
+    parser.add_argument("--batch", type=int, default=4, help="faces per frame")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'students':>8} {'histograms':>10} {'opencv pred/s':>14} {'numpy pred/s':>13} "
+          f"{'speedup':>8} {'labels match':>13}")
+    for students in args.students:
+        bases = [synthetic_face(rng) for _ in range(students)]
+        faces, ids = [], []
+        for label, base in enumerate(bases):
+            faces += [sample(base, rng) for _ in range(args.samples)]
+            ids += [label] * args.samples
+        recognizer = cv2.face.LBPHFaceRecognizer_create(radius=1, neighbors=8, grid_x=8, grid_y=8)
+        recognizer.train(faces, np.array(ids))
+        engine = LBPHEngine.from_recognizer(recognizer)
+
+        queries = [sample(bases[i % students], rng) for i in range(args.batch)]
+        opencv = rate(lambda q: [recognizer.predict(f) for f in q], queries, args.repeat)
+        numpy_rate = rate(engine.predict_batch, queries, args.repeat)
+        match = [recognizer.predict(f)[0] for f in queries] == [l for l, _ in engine.predict_batch(queries)]
+
+        print(f"{students:>8} {len(faces):>10} {opencv:>14.1f} {numpy_rate:>13.1f} "
+              f"{numpy_rate / opencv:>7.1f}x {str(match):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Accuracy vs speed of prototype compaction on a held-out split.
+
+Holds out the last --holdout fraction of every student's images (the end
+of the capture video, so held-out frames are not near-duplicates of
+training ones), compacts the rest to each prototype count with
+prototypes.select_prototypes(), and reports model size, OpenCV predict()
+rate and held-out accuracy. "accepted" counts predictions that are both
+correct and under the recognition confidence threshold.
+
+    python -m benchmarks.bench_prototypes --dataset . --counts 0 5 10 20 40
+    python -m benchmarks.bench_prototypes --synthetic 50 --frames 150
+
+A count of 0 keeps every sample (the uncompacted model).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prototypes import select_prototypes
+from training_data import ingest_images, list_dataset, list_profile_folders
+from face_cache import FaceCache
+
+
+def load_dataset(dataset_dir):
+    """[(label, [faces in capture order])] from the profile folders."""
+    dataset = sorted(list_dataset(dataset_dir, list_profile_folders(dataset_dir)),
+                     key=lambda item: item[1])
+    cache = FaceCache()
+    cached = [cache.lookup(path) for _, path in dataset]
+    fresh = ingest_images([path for (_, path), hit in zip(dataset, cached) if hit is None])
+    by_label = {}
+    for (label, _), hit in zip(dataset, cached):
+        status, face = hit if hit is not None else next(fresh)[1:]
+        if status == "ok":
+            by_label.setdefault(label, []).append(np.asarray(face))
+    return sorted(by_label.items())
+
+
+def synthetic_dataset(students, frames, rng):
+    """Smooth per-student faces drifting slowly, like a 30 second capture."""
+    data = []
+    for label in range(students):
+        base = cv2.GaussianBlur(rng.random((200, 200), dtype=np.float32), (0, 0), 6)
+        base = cv2.normalize(base, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+        shift = np.zeros(2)
+        faces = []
+        for _ in range(frames):
+            shift = np.clip(shift + rng.normal(0, 0.5, 2), -5, 5)
+            img = np.roll(base, tuple(np.round(shift).astype(int)), axis=(0, 1)).astype(np.int16)
+            img = np.clip(img + rng.integers(-6, 7, img.shape), 0, 255).astype(np.uint8)
+            faces.append(cv2.GaussianBlur(cv2.equalizeHist(img), (3, 3), 0))
+        data.append((label, faces))
+    return data
+
+
+def split(data, holdout):
+    train_faces, train_ids, test_faces, test_ids = [], [], [], []
+    for label, faces in data:
+        cut = max(1, int(round(len(faces) * (1 - holdout))))
+        train_faces += faces[:cut]
+        train_ids += [label] * cut
+        test_faces += faces[cut:]
+        test_ids += [label] * (len(faces) - cut)
+    return train_faces, np.array(train_ids), test_faces, np.array(test_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dataset", default=os.getcwd(), help="folder holding the profile folders")
+    parser.add_argument("--synthetic", type=int, metavar="STUDENTS",
+                        help="use generated faces instead of --dataset")
+    parser.add_argument("--frames", type=int, default=150, help="synthetic frames per student")
+    parser.add_argument("--counts", type=int, nargs="+", default=[0, 5, 10, 20, 40])
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=70, help="confidence threshold")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        data = synthetic_dataset(args.synthetic, args.frames, np.random.default_rng(0))
+    else:
+        data = load_dataset(args.dataset)
+    if not data:
+        sys.exit("No profile images found; pass --dataset or --synthetic.")
+    train_faces, train_ids, test_faces, test_ids = split(data, args.holdout)
+    print(f"{len(data)} students, {len(train_faces)} training / {len(test_faces)} held-out faces\n")
+
+    print(f"{'per label':>9} {'samples':>8} {'select s':>9} {'yml MB':>7} {'pred/s':>7} "
+          f"{'top-1':>6} {'accepted':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_file = os.path.join(tmp, "trainer.yml")
+        for count in args.counts:
+            start = time.perf_counter()
+            keep = select_prototypes(train_faces, train_ids, count)
+            select_s = time.perf_counter() - start
+
+            recognizer = cv2.face.LBPHFaceRecognizer_create(radius=1, neighbors=8, grid_x=8, grid_y=8)
+            recognizer.train([train_faces[i] for i in keep], train_ids[keep])
+            recognizer.save(model_file)
+            size_mb = os.path.getsize(model_file) / 1e6
+
+            start = time.perf_counter()
+            predictions = [recognizer.predict(face) for face in test_faces]
+            rate = len(test_faces) / (time.perf_counter() - start)
+            labels = np.array([label for label, _ in predictions])
+            distances = np.array([dist for _, dist in predictions])
+            top1 = np.mean(labels == test_ids)
+            accepted = np.mean((labels == test_ids) & (distances < args.threshold))
+
+            print(f"{count or 'all':>9} {len(keep):>8} {select_s:>9.2f} {size_mb:>7.1f} {rate:>7.1f} "
+                  f"{top1:>6.1%} {accepted:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Render cost per frame: the old per-frame allocations vs FrameRenderer.
+
+The old path copied the frame, resized it to 640x480 even when it already
+was, converted it to RGB, and built a new PIL image and PhotoImage every
+frame. frame_renderer.FrameRenderer draws into preallocated buffers and
+pastes into one persistent PhotoImage.
+
+Reports ms/frame and NumPy/OpenCV memory allocated per frame (tracemalloc;
+PIL and Tk buffers are outside its view, so those are counted as the
+images created per frame). The PhotoImage step is only timed when a
+display is available; otherwise only the conversion is compared.
+
+    python -m benchmarks.bench_render --frames 500 --faces 2
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_renderer import FrameRenderer
+
+
+def old_render(frame, detected_faces, label):
+    display_frame = frame.copy()
+    for (x, y, w, h, name, _, _) in detected_faces:
+        color = (0,255,0) if name != "Unknown" else (0,0,255)
+        cv2.rectangle(display_frame, (x, y), (x+w, y+h), color, 2)
+        cv2.putText(display_frame, name, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+    frame_resized = cv2.resize(display_frame, (640,480))
+    img_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
+    image = Image.fromarray(img_rgb)
+    if label is not None:
+        img_tk = ImageTk.PhotoImage(image)
+        label.img_tk = img_tk
+        label.config(image=img_tk)
+
+
+def new_render(renderer):
+    def render(frame, detected_faces, label):
+        if label is not None:
+            renderer.show(label, frame, detected_faces)
+        else:
+            renderer.draw(frame, detected_faces)
+    return render
+
+
+def measure(render, frames, faces, label, root):
+    for frame in frames[:10]:
+        render(frame, faces, label)
+    tracemalloc.start()
+    allocated = 0
+    start = time.perf_counter()
+    for frame in frames:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        render(frame, faces, label)
+        if root is not None:
+            root.update_idletasks()
+        allocated += tracemalloc.get_traced_memory()[1] - base
+    ms = (time.perf_counter() - start) / len(frames) * 1000
+    tracemalloc.stop()
+    return ms, allocated / len(frames) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--faces", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+    faces = [(60 + 260 * i, 120, 180, 180, "Unknown" if i % 2 else "Student", "", "")
+             for i in range(args.faces)]
+
+    root = label = None
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        label = tk.Label(root)
+        label.pack()
+    except Exception as e:
+        print(f"No display ({e}); timing conversion only, without PhotoImage\n")
+
+    print(f"{'path':>14} {'ms/frame':>9} {'KB alloc/frame':>15} {'PIL+Tk images/frame':>20}")
+    for name, render, images in (("old", old_render, 2 if label else 1),
+                                 ("FrameRenderer", new_render(FrameRenderer()), 0)):
+        ms, kb = measure(render, frames, faces, label, root)
+        print(f"{name:>14} {ms:>9.2f} {kb:>15.0f} {images:>20}")
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Arduino event latency and command send time: old polling loop vs SerialLink.
+
+Events are written into a pseudo-terminal at random moments. The old
+listener checked in_waiting and slept 0.1 s; serial_link.SerialLink blocks
+in readline(). Latency is from the write to the line reaching the consumer.
+
+Then commands are sent to a port nobody reads (a stalled Arduino): the old
+code wrote them from the camera thread, SerialLink.send() only queues
+them. The direct writes stop at the first one that stalls. Without a pty (Windows), only SerialLink is measured, over loop://.
+
+    python -m benchmarks.bench_serial --events 50
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import numpy as np
+import serial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serial_link import SerialLink
+
+
+def old_listener(port, received, stop):
+    """The listen_to_arduino() loop from face_recognition.py, recording arrival times."""
+    while not stop.is_set():
+        if port.in_waiting:
+            port.readline()
+            received.append(time.perf_counter())
+        time.sleep(0.1)
+
+
+def link_listener(link, received, stop):
+    while not stop.is_set():
+        try:
+            link.events.get(timeout=0.2)
+        except Exception:
+            continue
+        received.append(time.perf_counter())
+
+
+def event_latency(write, listen, count, rng):
+    received, sent = [], []
+    stop = threading.Event()
+    thread = threading.Thread(target=listen, args=(received, stop), daemon=True)
+    thread.start()
+    for _ in range(count):
+        time.sleep(rng.uniform(0.05, 0.25))
+        sent.append(time.perf_counter())
+        write(b"PERSON_DETECTED\n")
+    time.sleep(0.3)
+    stop.set()
+    thread.join()
+    return np.array(received[:len(sent)]) - np.array(sent[:len(received)])
+
+
+def report(name, latencies):
+    ms = latencies * 1000
+    print(f"{name:>12} {len(ms):>7} {np.mean(ms):>9.2f} {np.percentile(ms, 95):>9.2f} {np.max(ms):>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=10000,
+                        help="commands sent to the stalled port (the pty buffer holds a few thousand)")
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'listener':>12} {'events':>7} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    if not hasattr(os, "openpty"):
+        link = SerialLink("loop://", reset_delay=0)
+        link.start()
+        while not link.connected:
+            time.sleep(0.01)
+        report("SerialLink", event_latency(lambda data: link.send(data.decode().strip()),
+                                           lambda received, stop: link_listener(link, received, stop),
+                                           args.events, rng))
+        link.stop()
+        return
+
+    master, slave = os.openpty()
+    path = os.ttyname(slave)
+    write = lambda data: os.write(master, data)
+
+    port = serial.Serial(path, 9600, timeout=1)
+    report("old polling", event_latency(write, lambda received, stop: old_listener(port, received, stop),
+                                        args.events, rng))
+    port.close()
+
+    link = SerialLink(path, reset_delay=0)
+    link.start()
+    while not link.connected:
+        time.sleep(0.01)
+    report("SerialLink", event_latency(write, lambda received, stop: link_listener(link, received, stop),
+                                       args.events, rng))
+
+    # Nobody reads `master` now, so the pty buffer fills and writes stall
+    command = "OPEN|Student Name|20240123|5"
+    print(f"\n{'sender':>12} {'commands':>9} {'max ms':>9} {'total ms':>9}")
+    port = serial.Serial(path, 9600, timeout=1, write_timeout=0.2)
+    times = []
+    for _ in range(args.commands):
+        start = time.perf_counter()
+        try:
+            port.write((command + "\n").encode())
+        except serial.SerialTimeoutException:
+            # The old code had no write timeout: this write would never return
+            times.append(time.perf_counter() - start)
+            break
+        times.append(time.perf_counter() - start)
+    port.close()
+    print(f"{'direct write':>12} {len(times):>9} {max(times) * 1000:>9.2f} {sum(times) * 1000:>9.1f}")
+
+    times = []
+    for _ in range(args.commands):
+        start = time.perf_counter()
+        link.send(command)
+        times.append(time.perf_counter() - start)
+    print(f"{'send()':>12} {len(times):>9} {max(times) * 1000:>9.2f} {sum(times) * 1000:>9.1f}")
+    link.stop()
+    os.close(master)
+    os.close(slave)
+
+
+if __name__ == "__main__":
+    main()
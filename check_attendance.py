@@ -1,10 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import sqlite3
-import csv
+import queue
+import threading
 from datetime import datetime
+from attendance_query import PAGE_SIZE, build_filter, count_records, fetch_page, fts_enabled, row_key
+from attendance_export import ExportCancelled, export_attendance as stream_export, parquet_available
 
 DB_FILE = "attendance.db"
+SCHEMA_VERSION = 5
+FILTER_DEBOUNCE_MS = 300       # wait this long after the last keystroke before querying
+WINDOW_ROWS = 3 * PAGE_SIZE    # rows kept in the Treeview at once
+PREFETCH_MARGIN = 0.15         # fetch the next page within this fraction of either edge
 
 # -----------------------------
 # Ensure DB Exists
@@ -31,35 +38,130 @@ def init_db():
             department TEXT
         )
     ''')
+    migrate_db(cursor)
     conn.commit()
     conn.close()
 
+# -----------------------------
+# Schema Migrations
+# -----------------------------
+def migrate_db(cursor):
+    """Bring an existing database up to SCHEMA_VERSION (tracked in PRAGMA user_version)."""
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    if version < 1:
+        # Older builds could store several rows per student and day; keep the
+        # best one (Present over Absent, then the latest sighting) so the
+        # unique index can be created.
+        cursor.execute('''
+            DELETE FROM attendance_records WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY student_id, date
+                        ORDER BY status = 'Present' DESC, time DESC, id DESC
+                    ) AS rn
+                    FROM attendance_records
+                    WHERE student_id IS NOT NULL AND date IS NOT NULL
+                )
+                WHERE rn > 1
+            )
+        ''')
+        if cursor.rowcount > 0:
+            print(f"[INFO] Removed {cursor.rowcount} duplicate attendance rows")
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_attendance_student_date
+            ON attendance_records (student_id, date)
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance_records (date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_department ON attendance_records (department)")
+
+    if version < 2:
+        # Last date mark_absent_for_past_days() has already filled in
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS absent_backfill (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_date TEXT NOT NULL
+            )
+        ''')
+
+    if version < 3:
+        # Serves the viewer's ORDER BY date, time, id keyset scans; it also
+        # covers plain date lookups, so the single-column index goes away
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_date_time ON attendance_records (date, time)")
+        cursor.execute("DROP INDEX IF EXISTS idx_attendance_date")
+
+    if version < 4:
+        create_search_index(cursor)
+
+    if version < 5:
+        # Highest students.id already back-filled. Existing watermarks start
+        # at 0, so the next back-fill re-checks every student once
+        cursor.execute("ALTER TABLE absent_backfill ADD COLUMN last_student INTEGER NOT NULL DEFAULT 0")
+
+    if version < SCHEMA_VERSION:
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def create_search_index(cursor):
+    """
+    Full-text index over name and department for the viewer's search boxes,
+    kept in sync by triggers. SQLite builds without FTS5 get NOCASE indexes
+    instead, which serve the prefix LIKE fallback.
+    """
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS attendance_fts USING fts5(
+                name, department, content='attendance_records', content_rowid='id'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"[WARN] FTS5 unavailable ({e}), using prefix indexes for search")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_department_nocase ON attendance_records (department COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_name_nocase ON attendance_records (name COLLATE NOCASE)")
+        return
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS attendance_fts_insert AFTER INSERT ON attendance_records BEGIN
+            INSERT INTO attendance_fts (rowid, name, department) VALUES (new.id, new.name, new.department);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS attendance_fts_delete AFTER DELETE ON attendance_records BEGIN
+            INSERT INTO attendance_fts (attendance_fts, rowid, name, department)
+            VALUES ('delete', old.id, old.name, old.department);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS attendance_fts_update AFTER UPDATE OF name, department ON attendance_records BEGIN
+            INSERT INTO attendance_fts (attendance_fts, rowid, name, department)
+            VALUES ('delete', old.id, old.name, old.department);
+            INSERT INTO attendance_fts (rowid, name, department) VALUES (new.id, new.name, new.department);
+        END
+    ''')
+    cursor.execute("INSERT INTO attendance_fts (attendance_fts) VALUES ('rebuild')")
+
 # -----------------------------
 # Insert Attendance Record
 # -----------------------------
+def write_attendance_records(cursor, records):
+    """
+    Write (name, student_id, department, date, time, status) tuples.
+    The caller owns the transaction, so a batch commits once.
+    """
+    cursor.executemany('''
+        INSERT INTO attendance_records (name, student_id, department, date, time, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (student_id, date) DO UPDATE
+        SET status=excluded.status, time=excluded.time
+    ''', records)
+
 def add_attendance_record(name, student_id, department, status="Present"):
+    """Single synchronous write; the schema must exist (init_db())."""
     conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    time_str = datetime.now().strftime("%H:%M:%S")
-
-    cursor.execute('''
-        SELECT * FROM attendance_records 
-        WHERE student_id=? AND date=? 
-    ''', (student_id, date_str))
-    record = cursor.fetchone()
-
-    if record:
-        cursor.execute('''
-            UPDATE attendance_records 
-            SET status=?, time=? 
-            WHERE student_id=? AND date=?
-        ''', (status, time_str, student_id, date_str))
-    else:
-        cursor.execute('''
-            INSERT INTO attendance_records (name, student_id, department, date, time, status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (name, student_id, department, date_str, time_str, status))
+    now = datetime.now()
+    date_str = now.strftime("%Y-%m-%d")
+    time_str = now.strftime("%H:%M:%S")
+    write_attendance_records(cursor, [(name, student_id, department, date_str, time_str, status)])
     conn.commit()
     conn.close()
 
@@ -67,23 +169,50 @@ def add_attendance_record(name, student_id, department, status="Present"):
 # Auto mark absent for past days
 # -----------------------------
 def mark_absent_for_past_days():
+    """
+    Insert an Absent row for every student missing from a past attendance date.
+    The absent_backfill watermark records the last date and the highest
+    students.id already filled in: dates after it are checked for every
+    student, and every past date for students added since, so once a day has
+    been filled in, reopening the window costs a single lookup.
+    """
     conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
-    cursor.execute("SELECT student_id, name, department FROM students")
-    students = cursor.fetchall()
-    cursor.execute("SELECT DISTINCT date FROM attendance_records")
-    existing_dates = [row[0] for row in cursor.fetchall()]
     today = datetime.now().strftime("%Y-%m-%d")
 
-    for student_id, name, department in students:
-        cursor.execute("SELECT date FROM attendance_records WHERE student_id=?", (student_id,))
-        student_dates = [row[0] for row in cursor.fetchall()]
-        for date in existing_dates:
-            if date < today and date not in student_dates:
-                cursor.execute('''
-                    INSERT INTO attendance_records (name, student_id, department, date, time, status)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (name, student_id, department, date, "00:00:00", "Absent"))
+    cursor.execute("SELECT last_date, last_student FROM absent_backfill WHERE id = 1")
+    row = cursor.fetchone()
+    watermark, last_student = row if row else ("", 0)
+
+    absent_rows = '''
+        INSERT INTO attendance_records (name, student_id, department, date, time, status)
+        SELECT s.name, s.student_id, s.department, d.date, '00:00:00', 'Absent'
+        FROM students s
+        CROSS JOIN (
+            SELECT DISTINCT date FROM attendance_records
+            WHERE date > ? AND date < ?
+        ) d
+        WHERE {} AND NOT EXISTS (
+            SELECT 1 FROM attendance_records a
+            WHERE a.student_id = s.student_id AND a.date = d.date
+        )
+    '''
+    # Dates since the last run, for everyone
+    cursor.execute(absent_rows.format("1"), (watermark, today))
+    # Students added since the last run, for every past date
+    cursor.execute(absent_rows.format("s.id > ?"), ("", today, last_student))
+
+    # Read inside the write transaction, so no student can slip in between
+    cursor.execute("SELECT MAX(date) FROM attendance_records WHERE date < ?", (today,))
+    last_date = max(cursor.fetchone()[0] or "", watermark)
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM students")
+    max_student = max(cursor.fetchone()[0], last_student)
+    if (last_date, max_student) != (watermark, last_student):
+        cursor.execute('''
+            INSERT INTO absent_backfill (id, last_date, last_student) VALUES (1, ?, ?)
+            ON CONFLICT (id) DO UPDATE
+            SET last_date=excluded.last_date, last_student=excluded.last_student
+        ''', (last_date, max_student))
     conn.commit()
     conn.close()
 
@@ -136,6 +265,10 @@ def open_check_attendance_window():
     ttk.Combobox(filter_frame, textvariable=status_var,
                  values=["All", "Present", "Absent"], state="readonly", width=20).grid(row=0, column=5, padx=5)
 
+    tk.Label(filter_frame, text="Name:", bg="#f5f5f5", font=("Arial", 12)).grid(row=1, column=2, padx=5, pady=(5, 0))
+    name_var = tk.StringVar()
+    tk.Entry(filter_frame, textvariable=name_var, width=20).grid(row=1, column=3, padx=5, pady=(5, 0))
+
     # -----------------------------
     # Table Section
     # -----------------------------
@@ -149,11 +282,13 @@ def open_check_attendance_window():
         table.heading(col, text=col.capitalize())
         table.column(col, width=130, anchor="center")
 
+    count_label = tk.Label(frame, text="", bg="white", fg="#555", font=("Arial", 11))
+    count_label.pack(side="bottom", pady=(0, 10))
+
     table.pack(fill="both", expand=True, padx=20, pady=20)
 
     vsb = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
     vsb.pack(side="right", fill="y")
-    table.configure(yscrollcommand=vsb.set)
 
     # Style configuration
     style = ttk.Style()
@@ -165,70 +300,243 @@ def open_check_attendance_window():
     # -----------------------------
     # Functions
     # -----------------------------
-    def insert_with_color(row):
+    def insert_with_color(row, index="end"):
         # all black first
         values = list(row)
         tags = None
-        if row[-1].lower() == "present":
+        if (row[-1] or "").lower() == "present":
             tags = ("present_status",)
-        elif row[-1].lower() == "absent":
+        elif (row[-1] or "").lower() == "absent":
             tags = ("absent_status",)
-        table.insert("", "end", values=values, tags=tags)
+        table.insert("", index, values=values, tags=tags)
+
+    # The Treeview only ever holds a window of at most WINDOW_ROWS rows.
+    # Scrolling near either edge fetches the neighbouring page by keyset and
+    # trims the far end, so the table never holds the whole result set.
+    view = {"where": "1=1", "params": [], "total": 0, "offset": 0,
+            "more_above": False, "more_below": False, "loading": False}
+
+    def update_count_label():
+        shown = len(table.get_children())
+        if view["total"] == 0:
+            count_label.config(text="No records")
+        else:
+            first = view["offset"] + 1
+            count_label.config(text=f"Showing {first}-{view['offset'] + shown} of {view['total']} records")
 
-    def load_attendance():
+    conn = sqlite3.connect(DB_FILE)
+    use_fts = fts_enabled(conn.cursor())
+    conn.close()
+
+    # Filter queries run on a worker thread. Each request bumps the
+    # generation and interrupts the previous query; results from older
+    # generations are dropped when they arrive.
+    query_state = {"generation": 0, "conn": None, "after_id": None, "waiting": False}
+    query_results = queue.Queue()
+
+    def show_query(where, params):
+        query_state["generation"] += 1
+        generation = query_state["generation"]
+        if query_state["conn"] is not None:
+            query_state["conn"].interrupt()
+
+        def worker():
+            conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+            query_state["conn"] = conn
+            try:
+                cursor = conn.cursor()
+                total = count_records(cursor, where, params)
+                rows = fetch_page(cursor, where, params)
+                query_results.put((generation, where, params, total, rows, None))
+            except sqlite3.Error as e:
+                if generation == query_state["generation"]:
+                    query_results.put((generation, where, params, 0, [], e))
+            finally:
+                if query_state["conn"] is conn:
+                    query_state["conn"] = None
+                conn.close()
+
+        threading.Thread(target=worker, daemon=True).start()
+        count_label.config(text="Searching...")
+        if not query_state["waiting"]:
+            query_state["waiting"] = True
+            window.after(30, poll_query_results)
+
+    def poll_query_results():
+        while True:
+            try:
+                generation, where, params, total, rows, error = query_results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != query_state["generation"]:
+                continue
+            query_state["waiting"] = False
+            if error:
+                show_message("error", "Error", f"Could not load attendance:\n{error}")
+            else:
+                apply_query(where, params, total, rows)
+            return
+        window.after(30, poll_query_results)
+
+    def apply_query(where, params, total, rows):
         table.delete(*table.get_children())
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM attendance_records ORDER BY date DESC, time DESC")
-        for row in cursor.fetchall():
+        for row in rows:
             insert_with_color(row)
-        conn.close()
+        table.yview_moveto(0)
+        view.update(where=where, params=params, total=total, offset=0,
+                    more_above=False, more_below=len(rows) == PAGE_SIZE)
+        update_count_label()
 
-    def filter_attendance(*args):
-        table.delete(*table.get_children())
+    def item_key(item):
+        return row_key(table.item(item, "values"))
+
+    def load_below():
+        children = table.get_children()
+        if not children:
+            return
+        anchor = children[-1]
         conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        query = "SELECT * FROM attendance_records WHERE 1=1"
-        params = []
-        if filter_var.get() == "Today's Records":
-            today = datetime.now().strftime("%Y-%m-%d")
-            query += " AND date=?"
-            params.append(today)
-        if dept_var.get().strip():
-            query += " AND department LIKE ?"
-            params.append(f"%{dept_var.get().strip()}%")
-        if status_var.get() != "All":
-            query += " AND status=?"
-            params.append(status_var.get())
-        query += " ORDER BY date DESC, time DESC"
-        cursor.execute(query, params)
-        for row in cursor.fetchall():
+        rows = fetch_page(conn.cursor(), view["where"], view["params"], after=item_key(anchor))
+        conn.close()
+
+        for row in rows:
             insert_with_color(row)
+        view["more_below"] = len(rows) == PAGE_SIZE
+
+        children = table.get_children()
+        excess = len(children) - WINDOW_ROWS
+        if excess > 0:
+            table.delete(*children[:excess])
+            view["offset"] += excess
+            view["more_above"] = True
+        table.see(anchor)
+        update_count_label()
+
+    def load_above():
+        children = table.get_children()
+        if not children:
+            return
+        anchor = children[0]
+        conn = sqlite3.connect(DB_FILE)
+        rows = fetch_page(conn.cursor(), view["where"], view["params"], before=item_key(anchor))
         conn.close()
 
+        for i, row in enumerate(rows):
+            insert_with_color(row, i)
+        view["offset"] = max(0, view["offset"] - len(rows))
+        view["more_above"] = len(rows) == PAGE_SIZE and view["offset"] > 0
+
+        children = table.get_children()
+        excess = len(children) - WINDOW_ROWS
+        if excess > 0:
+            table.delete(*children[-excess:])
+            view["more_below"] = True
+        table.see(anchor)
+        update_count_label()
+
+    def on_scroll(first, last):
+        vsb.set(first, last)
+        if view["loading"]:
+            return
+        if view["more_below"] and float(last) >= 1 - PREFETCH_MARGIN:
+            view["loading"] = True
+            window.after_idle(run_load, load_below)
+        elif view["more_above"] and float(first) <= PREFETCH_MARGIN:
+            view["loading"] = True
+            window.after_idle(run_load, load_above)
+
+    def run_load(loader):
+        try:
+            loader()
+        finally:
+            view["loading"] = False
+
+    table.configure(yscrollcommand=on_scroll)
+
+    def load_attendance():
+        show_query("1=1", [])
+
+    def filter_attendance(*args):
+        query_state["after_id"] = None
+        where, params = build_filter(today_only=filter_var.get() == "Today's Records",
+                                     department=dept_var.get().strip(),
+                                     status=status_var.get(),
+                                     name=name_var.get().strip(),
+                                     use_fts=use_fts)
+        show_query(where, params)
+
+    def schedule_filter(*args, delay=FILTER_DEBOUNCE_MS):
+        if query_state["after_id"]:
+            window.after_cancel(query_state["after_id"])
+        query_state["after_id"] = window.after(delay, filter_attendance)
+
     def export_attendance():
+        filetypes = [("CSV files", "*.csv")]
+        if parquet_available():
+            filetypes.append(("Parquet files", "*.parquet"))
         file_path = filedialog.asksaveasfilename(parent=window, defaultextension=".csv",
-                                                 filetypes=[("CSV files", "*.csv")])
+                                                 filetypes=filetypes)
         if not file_path:
             return
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM attendance_records")
-        rows = cursor.fetchall()
-        conn.close()
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["ID", "Name", "Student ID", "Department", "Date", "Time", "Status"])
-            writer.writerows(rows)
-        show_message("info", "Success", f"Attendance exported successfully to {file_path}")
+
+        # Export whatever the table is currently filtered to
+        where, params = view["where"], list(view["params"])
+
+        progress_win = tk.Toplevel(window)
+        progress_win.title("Exporting...")
+        progress_win.geometry("400x150")
+        progress_win.configure(bg="#f5f5f5")
+        progress_win.transient(window)
+        progress_label = tk.Label(progress_win, text="Starting export...", bg="#f5f5f5", font=("Arial", 12))
+        progress_label.pack(pady=(15, 5))
+        progress_bar = ttk.Progressbar(progress_win, orient="horizontal", length=350, mode="determinate")
+        progress_bar.pack(pady=5)
+
+        cancel = threading.Event()
+        state = {"done": 0, "total": 0, "finished": False, "error": None}
+
+        tk.Button(progress_win, text="Cancel", bg="#F44336", fg="white",
+                  font=("Arial", 12, "bold"), command=cancel.set).pack(pady=10)
+        progress_win.protocol("WM_DELETE_WINDOW", cancel.set)
+
+        def on_progress(done, total):
+            state["done"], state["total"] = done, total
+
+        def worker():
+            try:
+                stream_export(file_path, where, params, progress=on_progress,
+                              cancel=cancel, db_file=DB_FILE)
+            except Exception as e:
+                state["error"] = e
+            state["finished"] = True
+
+        def poll():
+            total = state["total"] or 1
+            progress_bar["maximum"] = total
+            progress_bar["value"] = state["done"]
+            progress_label.config(text=f"Exported {state['done']} of {state['total']} rows")
+            if not state["finished"]:
+                window.after(100, poll)
+                return
+            progress_win.destroy()
+            if isinstance(state["error"], ExportCancelled):
+                show_message("warning", "Cancelled", "Export cancelled.")
+            elif state["error"]:
+                show_message("error", "Error", f"Export failed:\n{state['error']}")
+            else:
+                show_message("info", "Success", f"Attendance exported successfully to {file_path}")
+
+        threading.Thread(target=worker, daemon=True).start()
+        poll()
 
     def refresh():
         filter_attendance()
         show_message("info", "Refreshed", "Attendance data refreshed!")
 
-    filter_var.trace_add("write", filter_attendance)
-    dept_var.trace_add("write", filter_attendance)
-    status_var.trace_add("write", filter_attendance)
+    filter_var.trace_add("write", lambda *args: schedule_filter(delay=0))
+    dept_var.trace_add("write", schedule_filter)
+    name_var.trace_add("write", schedule_filter)
+    status_var.trace_add("write", lambda *args: schedule_filter(delay=0))
 
     btn_frame = tk.Frame(window, bg="#f5f5f5")
     btn_frame.pack(pady=10)
@@ -4,6 +4,8 @@ import sqlite3
 import os
 import cv2
 import time
+from profile_cache import profile_cache
+from face_detector import FaceDetector
 
 DB_FILE = "profiles.db"
 
@@ -23,6 +25,7 @@ def capture_video_and_save(name, student_id, parent):
     messagebox.showinfo("Recording", "Recording started for 30 seconds. Press 'q' to stop early.", parent=parent)
     start_time = time.time()
     frame_count = 0
+    detector = FaceDetector()
 
     while True:
         ret, frame = cap.read()
@@ -38,8 +41,7 @@ def capture_video_and_save(name, student_id, parent):
         # Optional: Draw rectangle around detected face in real-time
         gray = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)
         gray = cv2.equalizeHist(gray)
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=6, minSize=(80, 80))
+        faces = detector.detect(gray)
         for (x, y, w, h) in faces:
             cv2.rectangle(frame_resized, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
@@ -65,7 +67,7 @@ def capture_video_and_save(name, student_id, parent):
 # Helper: Extract faces from captured frames (updated)
 # -------------------------------------
 def extract_faces_from_folder(folder_name, parent):
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    detector = FaceDetector()
     files = [f for f in os.listdir(folder_name) if f.lower().endswith(('.jpg', '.png', '.jpeg'))]
 
     if not files:
@@ -84,13 +86,7 @@ def extract_faces_from_folder(folder_name, parent):
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         gray = cv2.equalizeHist(gray)
 
-        faces = face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=6,
-            minSize=(80, 80),
-            flags=cv2.CASCADE_SCALE_IMAGE
-        )
+        faces = detector.detect(gray)
 
         if len(faces) == 0:
             continue
@@ -199,6 +195,7 @@ def open_create_profile(parent):
                            (student_id, name, dept))
             conn.commit()
             conn.close()
+            profile_cache.invalidate()
 
             profile_window.attributes('-topmost', True)
             messagebox.showinfo("Success", f"Profile created for {name} (ID: {student_id})", parent=profile_window)
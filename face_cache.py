@@ -0,0 +1,154 @@
+import glob
+import hashlib
+import os
+import sqlite3
+import numpy as np
+from training_data import FACE_SIZE
+
+# --------------------- CONFIG ---------------------
+CACHE_DIR = "face_cache"
+CACHE_VERSION = 1   # bump whenever detection or preprocess_face() changes
+
+
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class FaceCache:
+    """
+    On-disk cache of detected-and-preprocessed training crops.
+
+    Crops live in one memory-mapped .npy array of shape (N, 200, 200);
+    a SQLite manifest maps each image path to its mtime, size, SHA-1 and
+    row in that array. An image whose mtime and size are unchanged is a hit
+    without being read; otherwise its content hash is checked, so touched
+    or renamed-but-identical files still hit.
+
+    Images with no face or that failed to decode are cached too (row -1),
+    so they are not re-detected on every run.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        self._by_path = {}
+        self._by_hash = {}
+        self._crops = None
+        self._crops_file = None
+        self._new_entries = {}
+        self._load()
+
+    # ---------------- Manifest ----------------
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.cache_dir, "manifest.db"))
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER,
+                sha1 TEXT,
+                status TEXT,
+                row INTEGER
+            )
+        ''')
+        return conn
+
+    def _load(self):
+        conn = self._connect()
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        if meta.get("version") == str(CACHE_VERSION) and meta.get("crops_file"):
+            crops_path = os.path.join(self.cache_dir, meta["crops_file"])
+            if os.path.exists(crops_path):
+                self._crops = np.load(crops_path, mmap_mode="r")
+                self._crops_file = meta["crops_file"]
+                for path, mtime_ns, size, sha1, status, row in conn.execute("SELECT * FROM entries"):
+                    entry = (mtime_ns, size, sha1, status, row)
+                    self._by_path[path] = entry
+                    self._by_hash.setdefault(sha1, entry)
+        conn.close()
+
+    # ---------------- Lookup / Store ----------------
+    def _face(self, status, row):
+        return self._crops[row] if status == "ok" else None
+
+    def lookup(self, path):
+        """Return (status, face) for a cached image, or None on a miss."""
+        st = os.stat(path)
+        entry = self._by_path.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            self._new_entries[path] = entry
+            self.hits += 1
+            return entry[3], self._face(entry[3], entry[4])
+
+        sha1 = file_sha1(path)
+        entry = self._by_hash.get(sha1)
+        if entry:
+            self._new_entries[path] = (st.st_mtime_ns, st.st_size, sha1, entry[3], entry[4])
+            self.hits += 1
+            return entry[3], self._face(entry[3], entry[4])
+
+        self.misses += 1
+        return None
+
+    def fingerprint(self, path):
+        """SHA-1 of an image looked up or stored during this run."""
+        return self._new_entries[path][2]
+
+    def store(self, path, status, face):
+        st = os.stat(path)
+        self._new_entries[path] = (st.st_mtime_ns, st.st_size, file_sha1(path), status, face)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # ---------------- Persist ----------------
+    def save(self):
+        """
+        Write every image seen this run (hits and new crops) to a fresh
+        crops file and manifest. Images not seen this run are dropped.
+        """
+        entries = self._new_entries
+        faces = [path for path, e in entries.items() if e[3] == "ok"]
+
+        version = 0
+        if self._crops_file:
+            version = int(self._crops_file.split("-")[1].split(".")[0]) + 1
+        crops_file = f"crops-{version}.npy"
+        crops = np.lib.format.open_memmap(os.path.join(self.cache_dir, crops_file), mode="w+",
+                                          dtype=np.uint8, shape=(len(faces),) + FACE_SIZE)
+        rows = {}
+        for row, path in enumerate(faces):
+            face = entries[path][4]
+            crops[row] = self._crops[face] if isinstance(face, (int, np.integer)) else face
+            rows[path] = row
+        crops.flush()
+        del crops
+
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", [
+                (path, e[0], e[1], e[2], e[3], rows.get(path, -1)) for path, e in entries.items()
+            ])
+            conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                             [("version", str(CACHE_VERSION)), ("crops_file", crops_file)])
+        conn.close()
+
+        # Old crop files may still be mapped (Windows refuses to delete them);
+        # whatever is left over is removed on a later save
+        for old in glob.glob(os.path.join(self.cache_dir, "crops-*.npy")):
+            if os.path.basename(old) != crops_file:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
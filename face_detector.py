@@ -0,0 +1,80 @@
+import math
+import cv2
+
+# --------------------- CONFIG ---------------------
+DETECTION_WIDTH = 320       # frames are downscaled to this width before detection (0 = full size)
+SCALE_FACTOR = 1.1
+MIN_NEIGHBORS = 6
+
+# Expected door geometry, used to bound the face sizes searched for
+NEAREST_DISTANCE_M = 0.3    # closest a face gets to the camera
+FARTHEST_DISTANCE_M = 1.5   # farthest face that should still be recognised
+FACE_WIDTH_M = 0.16         # typical adult face width
+CAMERA_HFOV_DEG = 60        # horizontal field of view of a typical webcam
+SIZE_SLACK = 1.25           # tolerance on the computed size range, both ways
+
+CASCADE_WINDOW = 24         # haarcascade_frontalface_default training size
+
+
+def face_size_range(frame_width, near=NEAREST_DISTANCE_M, far=FARTHEST_DISTANCE_M,
+                    face_width=FACE_WIDTH_M, hfov_deg=CAMERA_HFOV_DEG):
+    """
+    (min, max) face box width in pixels for faces between `near` and `far`
+    metres from a camera producing `frame_width`-pixel-wide frames.
+    A `near` or `far` of None leaves that end open (max None, min the
+    cascade's own window).
+    """
+    # Width in pixels of one metre at one metre's distance
+    pixels_per_m = frame_width / (2 * math.tan(math.radians(hfov_deg) / 2))
+    smallest, largest = CASCADE_WINDOW, None
+    if far:
+        smallest = max(CASCADE_WINDOW, int(pixels_per_m * face_width / far / SIZE_SLACK))
+    if near:
+        largest = max(CASCADE_WINDOW, int(math.ceil(pixels_per_m * face_width / near * SIZE_SLACK)))
+    return smallest, largest
+
+
+class FaceDetector:
+    """
+    Haar face detection on a downscaled copy of the frame.
+
+    The cascade runs on a frame `width` pixels wide, searching only face
+    sizes between `near` and `far` metres (set either to None to lift that
+    bound), and the boxes are mapped back to the coordinates of the frame
+    passed in, ready for full-resolution recognition crops.
+
+    Like CascadeClassifier itself, an instance is not thread-safe.
+    """
+
+    def __init__(self, width=DETECTION_WIDTH, scale_factor=SCALE_FACTOR,
+                 min_neighbors=MIN_NEIGHBORS, near=NEAREST_DISTANCE_M, far=FARTHEST_DISTANCE_M):
+        self.width = width
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.near = near
+        self.far = far
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+    def detect(self, gray):
+        """Face boxes (x, y, w, h) in `gray`'s own coordinates."""
+        height, width = gray.shape[:2]
+        scale = 1.0
+        small = gray
+        if self.width and width > self.width:
+            scale = self.width / width
+            small = cv2.resize(gray, (self.width, int(round(height * scale))), interpolation=cv2.INTER_AREA)
+
+        smallest, largest = face_size_range(small.shape[1], self.near, self.far)
+        faces = self.cascade.detectMultiScale(small, scaleFactor=self.scale_factor,
+                                              minNeighbors=self.min_neighbors,
+                                              minSize=(smallest, smallest),
+                                              maxSize=(largest, largest) if largest else (0, 0))
+        if scale == 1.0:
+            return [tuple(int(v) for v in face) for face in faces]
+
+        boxes = []
+        for (x, y, w, h) in faces:
+            x0, y0 = int(round(x / scale)), int(round(y / scale))
+            x1, y1 = min(width, int(round((x + w) / scale))), min(height, int(round((y + h) / scale)))
+            boxes.append((x0, y0, x1 - x0, y1 - y0))
+        return boxes
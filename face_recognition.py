@@ -1,48 +1,35 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 import cv2, os
-import sqlite3
 import time
-import threading
-from collections import deque
-from check_attendance import add_attendance_record
-import serial
+from attendance_writer import attendance_writer
+from recognition_pipeline import RecognitionPipeline
+from recognition_session import RecognitionSession
+from frame_renderer import FrameRenderer
+from motion_gate import MotionGate
+from serial_link import get_link
+from door import unlock_door_with_lcd
+from profile_cache import profile_cache
+from model_manager import model_manager
+from settings_interface import camera_sources, load_settings
 
 # --------------------- CONFIG ---------------------
-DB_FILE = "profiles.db"
-MODEL_FILE = "trainer.yml"
-CONFIDENCE_THRESHOLD = 70
-SMOOTHING_FRAMES = 15
-COOLDOWN = 10
 AUTO_OFF_DELAY = 10
-
-# ------------------ SERIAL ARDUINO SETUP ------------------
-arduino = serial.Serial('COM3', 9600, timeout=1)
-time.sleep(2)
-
-# ------------------ HELPER FUNCTIONS ------------------
-def unlock_door_with_lcd(name, student_id, duration=5):
-    try:
-        command = f"OPEN|{name}|{student_id}|{duration}\n"
-        arduino.write(command.encode())
-        print(f"[INFO] Door unlock command sent for {name}")
-    except Exception as e:
-        print(f"[ERROR] Could not send command to Arduino: {e}")
-
-def get_profile_from_db(student_id):
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name, department FROM profiles WHERE student_id = ?", (str(student_id),))
-        row = cursor.fetchone()
-        conn.close()
-        return row if row else (None, None)
-    except:
-        return None, None
+PIPELINE_MODE = True      # capture / recognition / render on separate threads
+PIPELINE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+PIPELINE_QUEUE_SIZE = 2
+PIPELINE_DROP_POLICY = "latest"   # "latest": recognise the newest frame; "oldest": queue PIPELINE_QUEUE_SIZE
+IDLE_AFTER = 5            # seconds without faces before recognition drops to IDLE_RECOGNITION_HZ
+IDLE_RECOGNITION_HZ = 4
+MOTION_GATE = True        # skip detection while nothing in view moves
 
 # --------------------- FACE RECOGNITION WINDOW ---------------------
 def open_face_recognition_window():
+    # Shared with door.py; port and baud rate from settings.json
+    arduino_link = get_link()
+    arduino_link.poll()       # events from before this window opened are stale
+    model_manager.start()
+
     window = tk.Toplevel()
     window.title("Face Recognition - Attendance System")
     window.geometry("1150x720")
@@ -87,8 +74,12 @@ def open_face_recognition_window():
                             font=("Arial",14,"bold"), fg="red", bg="#f5f5f5")
     status_label.pack(pady=(0,10))
 
+    metrics_label = tk.Label(window, text="", font=("Arial",10), fg="#555", bg="#f5f5f5")
+    metrics_label.pack()
+
     # ---------------- Recognition Variables ----------------
-    cap = cv2.VideoCapture(0)
+    # The window previews the first configured camera; multi_camera.py runs them all
+    cap = cv2.VideoCapture(camera_sources(load_settings())[0])
     if not cap.isOpened():
         messagebox.showerror("Error", "Could not open webcam.")
         window.destroy()
@@ -97,27 +88,34 @@ def open_face_recognition_window():
     cap.set(3,640)
     cap.set(4,480)
 
-    recognizer = None
     running = False
-    last_logged = {}
-    recent_ids = deque(maxlen=SMOOTHING_FRAMES)
     last_detection_time = 0
+    pipeline = None
+
+    def on_recognized(name, student_id, dept):
+        attendance_writer.submit(name, student_id, dept)
+        unlock_door_with_lcd(name, student_id, 5)
 
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    session = RecognitionSession(on_recognized)
+    renderer = FrameRenderer()
 
     # ---------------- Start Recognition ----------------
     def start_scan():
-        nonlocal running, recognizer
+        nonlocal running
         if running:
             return
+        # The model stays resident in model_manager; this only waits for it
+        # the first time
         try:
-            recognizer = cv2.face.LBPHFaceRecognizer_create()
-            recognizer.read(MODEL_FILE)
+            model_manager.get()
         except Exception as e:
             messagebox.showerror("Error", f"Could not load model:\n{e}")
             return
+        model_manager.scan_started()
 
         running = True
+        if pipeline:
+            pipeline.set_recognition(True)
         status_label.config(text="Recognition Active", fg="green")
         print("[INFO] Recognition started (Manual or Ultrasonic Trigger)")
 
@@ -125,6 +123,10 @@ def open_face_recognition_window():
     def stop_scan():
         nonlocal running
         running = False
+        model_manager.scan_stopped()
+        session.reset()
+        if pipeline:
+            pipeline.set_recognition(False)
         name_label.config(text="N/A")
         id_label.config(text="N/A")
         dept_label.config(text="N/A")
@@ -139,107 +141,110 @@ def open_face_recognition_window():
                           command=start_scan)
     start_btn.pack(pady=5)
 
-    # ---------------- Listen to Arduino ----------------
-    def listen_to_arduino():
+    # ---------------- Arduino Events ----------------
+    # Read by serial_link's reader thread; handled here on the Tk thread every tick
+    def handle_arduino_events():
         nonlocal last_detection_time
-        while True:
-            try:
-                if arduino.in_waiting:
-                    msg = arduino.readline().decode().strip()
-
-                    if msg == "PERSON_DETECTED":
-                        print("[ULTRASONIC] Person detected — starting scan.")
-                        start_scan()
-                        last_detection_time = time.time()
-
-                    elif msg == "SCAN":
-                        start_scan()
-                        last_detection_time = time.time()
+        for msg in arduino_link.poll():
+            if msg == "PERSON_DETECTED":
+                print("[ULTRASONIC] Person detected — starting scan.")
+                start_scan()
+                last_detection_time = time.time()
 
-                    elif msg == "CLEAR":
-                        last_detection_time = 0
+            elif msg == "SCAN":
+                start_scan()
+                last_detection_time = time.time()
 
-            except:
-                pass
-
-            time.sleep(0.1)
+            elif msg == "CLEAR":
+                last_detection_time = 0
 
-    threading.Thread(target=listen_to_arduino, daemon=True).start()
+    # ---------------- Detection + Recognition ----------------
+    def recognize_frame(frame, seq=None):
+        nonlocal last_detection_time
+        if not running:
+            return []
+        detected_faces = session.process(frame, seq)
+        if session.last_seen > last_detection_time:
+            last_detection_time = session.last_seen
+        return detected_faces
+
+    # ---------------- Render ----------------
+    def render(frame, detected_faces):
+        nonlocal last_detection_time
+        # Update GUI labels
+        if detected_faces:
+            first = detected_faces[0]
+            name_label.config(text=first[4])
+            id_label.config(text=str(first[5]))
+            dept_label.config(text=first[6])
+        else:
+            name_label.config(text="N/A")
+            id_label.config(text="N/A")
+            dept_label.config(text="N/A")
+
+        # Draw boxes into the reused buffers and photo
+        renderer.show(cam_label, frame, detected_faces)
+
+        # Auto stop
+        if running and last_detection_time and (time.time() - last_detection_time > AUTO_OFF_DELAY):
+            stop_scan()
+            last_detection_time = 0
 
     # ---------------- Camera Loop ----------------
     def update_camera():
-        nonlocal last_detection_time, running
-
+        handle_arduino_events()
         ret, frame = cap.read()
         if ret:
-            display_frame = frame.copy()
-            detected_faces = []
-
-            if running and recognizer:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                gray = cv2.equalizeHist(gray)
-                faces = face_cascade.detectMultiScale(gray, 1.1, 6)
-
-                for (x, y, w, h) in faces:
-                    face_roi = cv2.resize(gray[y:y+h, x:x+w], (200,200))
-                    face_roi = cv2.equalizeHist(face_roi)
-                    id_, confidence = recognizer.predict(face_roi)
-
-                    if confidence < CONFIDENCE_THRESHOLD:
-                        recent_ids.append(id_)
-                    else:
-                        recent_ids.append("Unknown")
-
-                    final_id = max(set(recent_ids), key=recent_ids.count)
-
-                    if final_id != "Unknown":
-                        name, dept = get_profile_from_db(final_id)
-                        if name:
-                            detected_faces.append((x, y, w, h, name, final_id, dept))
-                            now = time.time()
-                            if (final_id not in last_logged) or (now - last_logged[final_id] > COOLDOWN):
-                                add_attendance_record(name, final_id, dept)
-                                last_logged[final_id] = now
-                                unlock_door_with_lcd(name, final_id, 5)
-                            last_detection_time = time.time()
-                    else:
-                        detected_faces.append((x, y, w, h, "Unknown", "", ""))
-
-            # Update GUI labels
-            if detected_faces:
-                first = detected_faces[0]
-                name_label.config(text=first[4])
-                id_label.config(text=str(first[5]))
-                dept_label.config(text=first[6])
-            else:
-                name_label.config(text="N/A")
-                id_label.config(text="N/A")
-                dept_label.config(text="N/A")
-
-            # Draw boxes
-            for (x, y, w, h, name, _, _) in detected_faces:
-                color = (0,255,0) if name != "Unknown" else (0,0,255)
-                cv2.rectangle(display_frame, (x, y), (x+w, y+h), color, 2)
-                cv2.putText(display_frame, name, (x, y-10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-
-            frame_resized = cv2.resize(display_frame, (640,480))
-            img_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-            img_tk = ImageTk.PhotoImage(Image.fromarray(img_rgb))
-            cam_label.img_tk = img_tk
-            cam_label.config(image=img_tk)
-
-            # Auto stop
-            if running and last_detection_time and (time.time() - last_detection_time > AUTO_OFF_DELAY):
-                stop_scan()
-                last_detection_time = 0
+            render(frame, recognize_frame(frame))
 
         cam_label.after(5, update_camera)
 
-    update_camera()
+    # ---------------- Pipelined Camera Loop ----------------
+    def update_pipeline():
+        handle_arduino_events()
+        frame, detected_faces = pipeline.latest()
+        if frame is not None:
+            render(frame, detected_faces)
+
+        # Paced to the camera instead of polling, so clicks are not starved
+        cam_label.after(pipeline.next_tick_ms(frame is not None), update_pipeline)
+
+    def update_metrics():
+        cache = profile_cache.stats()
+        first = model_manager.stats()["first_recognition"]
+        tracking = session.stats()
+        link = arduino_link.stats()
+        latency = link["last_latency"]
+        unlocks = link["commands"].get("OPEN")
+        metrics_label.config(text=f"{pipeline.metrics_text()} | "
+                                  f"Detect {tracking['detect_frames']} / track {tracking['track_frames']} frames | "
+                                  f"Recognized {tracking['recognitions']} / skipped {tracking['skipped']} faces | "
+                                  f"Profile cache {cache['hits']} hits / {cache['misses']} misses | "
+                                  f"First recognition {'-' if first is None else f'{first * 1000:.0f} ms'} | "
+                                  f"Arduino {'connected' if link['connected'] else 'offline'}, "
+                                  f"event latency {'-' if latency is None else f'{latency * 1000:.0f} ms'}, "
+                                  f"unlock write {'-' if unlocks is None else f'{unlocks[1] * 1000:.0f} ms avg'}")
+        window.after(1000, update_metrics)
+
+    if PIPELINE_MODE:
+        pipeline = RecognitionPipeline(cap, recognize_frame,
+                                       workers=PIPELINE_WORKERS,
+                                       queue_size=PIPELINE_QUEUE_SIZE,
+                                       drop_policy=PIPELINE_DROP_POLICY,
+                                       idle_after=IDLE_AFTER,
+                                       idle_hz=IDLE_RECOGNITION_HZ,
+                                       motion_gate=MotionGate() if MOTION_GATE else None)
+        pipeline.start()
+        update_pipeline()
+        update_metrics()
+    else:
+        update_camera()
 
     def on_close():
+        if pipeline:
+            pipeline.stop()
         cap.release()
+        attendance_writer.close()
         window.destroy()
 
     window.protocol("WM_DELETE_WINDOW", on_close)
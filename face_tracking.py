@@ -0,0 +1,295 @@
+import itertools
+from collections import Counter, namedtuple
+import cv2
+
+# --------------------- CONFIG ---------------------
+DETECT_EVERY = 5          # run the cascade on every Nth frame (and when a track is lost)
+RECOGNIZE_EVERY = 15      # re-check a face settled as unknown after this many frames
+SMOOTHING_FRAMES = 15     # identity votes kept per track
+CONFIDENT_VOTES = 5       # votes needed before a track's identity can settle
+CONFIDENT_SHARE = 0.8     # share of the votes the winner needs to settle
+TRACK_SCALE = 0.5         # template matching runs on a frame downscaled by this factor
+SEARCH_MARGIN = 0.4       # search window grows the last box by this fraction per side
+MATCH_THRESHOLD = 0.6     # TM_CCOEFF_NORMED score below which a track is lost
+REFRESH_SCORE = 0.8       # weaker matches trigger a fresh recognition
+IOU_MATCH = 0.3           # detection/track overlap needed to continue a track
+MAX_MISSES = 2            # detections a track may miss before it is dropped
+
+
+# One frame between FaceTracker.begin() and finish()
+FrameStep = namedtuple("FrameStep", "detect small seq generation")
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = min(ax + aw, bx + bw) - max(ax, bx)
+    h = min(ay + ah, by + bh) - max(ay, by)
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class IdentityVoter:
+    """
+    The last `size` recognition results of one track, with running counts.
+
+    push() updates the counts for the new vote and the evicted one, and
+    keeps the current winner, so a decision costs O(1); the counts are only
+    rescanned when the winner itself loses a vote. Ties keep the existing
+    winner.
+    """
+
+    def __init__(self, size=SMOOTHING_FRAMES):
+        self.size = size
+        self.counts = Counter()
+        self.winner = None
+        self._ring = [None] * size
+        self._next = 0
+        self._filled = 0
+
+    def __len__(self):
+        return self._filled
+
+    def push(self, vote):
+        """Add one vote ("Unknown" or a student id); returns the winner."""
+        evicting = self._filled == self.size
+        evicted = self._ring[self._next]
+        if evicting:
+            self.counts[evicted] -= 1
+            if not self.counts[evicted]:
+                del self.counts[evicted]
+        else:
+            self._filled += 1
+        self._ring[self._next] = vote
+        self._next = (self._next + 1) % self.size
+        self.counts[vote] += 1
+
+        if evicting and evicted == self.winner and evicted != vote:
+            # The winner lost a vote; another identity may now lead
+            if self.counts[self.winner] < max(self.counts.values()):
+                self.winner = max(self.counts, key=self.counts.__getitem__)
+        elif self.winner is None or self.counts[vote] > self.counts[self.winner]:
+            self.winner = vote
+        return self.winner
+
+    def confident(self):
+        """Enough votes, and enough of them agree, to stop recognising."""
+        return (self._filled >= CONFIDENT_VOTES and
+                self.counts[self.winner] >= CONFIDENT_SHARE * self._filled)
+
+
+class Track:
+    """One face followed across frames, with its own identity votes."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, box, template, smoothing=SMOOTHING_FRAMES):
+        self.id = next(self._ids)
+        self.box = box
+        self.template = template
+        self.score = 1.0
+        self.misses = 0
+        self.votes = IdentityVoter(smoothing)
+        self.identity = None      # set by the caller after recognition
+        self.recognized_at = None
+
+
+class FaceTracker:
+    """
+    Detect-then-track: the Haar cascade runs only every `detect_every`
+    frames, when nothing is tracked, or right after a track is lost. In
+    between, every face box is followed by template matching inside a small
+    search window around its last position, on a downscaled frame.
+
+    Detections are matched to tracks by IoU, so a person keeps their track
+    (and identity) across detections. Each track votes on its own identity
+    (IdentityVoter), so two people in view never mix. `due_for_recognition()`
+    returns the tracks worth running the recognizer on: new ones, ones
+    whose vote has not settled yet, ones whose match score dropped, and
+    ones settled as unknown every `recognize_every` frames. A track settled
+    on a known student is not recognised again while it tracks well.
+
+    Not thread-safe: callers serialise `begin()` and `finish()`, but may
+    run the cascade between them without a lock, so several workers detect
+    in parallel (`update()` does all three for a single thread). Frames
+    older than the last one begun are dropped, and so are detections older
+    than the last ones applied (pipeline workers finish out of order).
+    """
+
+    def __init__(self, detect, detect_every=DETECT_EVERY, recognize_every=RECOGNIZE_EVERY,
+                 smoothing=SMOOTHING_FRAMES):
+        self.detect = detect
+        self.detect_every = detect_every
+        self.recognize_every = recognize_every
+        self.smoothing = smoothing
+        self.tracks = []
+        self.frame_index = 0
+        self.detect_frames = 0
+        self.track_frames = 0
+        self.recognitions = 0
+        self.skipped = 0
+        self._last_seq = None
+        self._last_detect_seq = None
+        self._generation = 0
+        self._since_detect = 0
+        self._lost = False
+
+    def reset(self):
+        self.tracks = []
+        self._last_seq = None
+        self._last_detect_seq = None
+        self._generation += 1     # detections still running belong to the old scan
+        self._lost = False
+
+    # ---------------- Per Frame ----------------
+    def update(self, gray, seq=None):
+        """
+        Advance all tracks to `gray` (the equalised grayscale frame).
+        Returns the current tracks, or None when `seq` is stale.
+        """
+        step = self.begin(gray, seq)
+        if step is None:
+            return None
+        return self.finish(step, self.detect(gray) if step.detect else None)
+
+    def stale(self, seq):
+        """Whether begin() would drop frame `seq`; cheap enough to check first."""
+        last = self._last_seq
+        return seq is not None and last is not None and seq <= last
+
+    def begin(self, gray, seq=None):
+        """
+        Start frame `seq`: returns None when it is stale, else a FrameStep.
+        Without `step.detect` the tracks have already followed the faces on
+        this frame. With it, the caller runs `self.detect(gray)` (outside its
+        lock) and passes the boxes to `finish()`.
+        """
+        if self.stale(seq):
+            return None
+        if seq is not None:
+            self._last_seq = seq
+        self.frame_index += 1
+        small = cv2.resize(gray, None, fx=TRACK_SCALE, fy=TRACK_SCALE, interpolation=cv2.INTER_AREA)
+
+        self._since_detect += 1
+        if not self.tracks or self._lost or self._since_detect >= self.detect_every:
+            # Claimed now, so frames begun meanwhile track instead of detecting again
+            self.detect_frames += 1
+            self._since_detect = 0
+            self._lost = False
+            return FrameStep(True, small, seq, self._generation)
+        self._follow(small)
+        return FrameStep(False, small, seq, self._generation)
+
+    def finish(self, step, detections=None):
+        """
+        Apply a begun frame's detections. Returns the current tracks, or None
+        when newer detections were applied first or the tracker was reset.
+        """
+        if not step.detect:
+            return self.tracks
+        if step.generation != self._generation:
+            return None
+        if step.seq is not None:
+            if self._last_detect_seq is not None and step.seq < self._last_detect_seq:
+                return None
+            self._last_detect_seq = step.seq
+        self._associate(step.small, detections)
+        return self.tracks
+
+    def needs_recognition(self, track):
+        if track.recognized_at is None or track.score < REFRESH_SCORE:
+            return True
+        if not track.votes.confident():
+            return True
+        if track.identity is None:
+            return self.frame_index - track.recognized_at >= self.recognize_every
+        return False
+
+    def due_for_recognition(self):
+        """Tracks to recognise on this frame; they count as checked from now on."""
+        due = [track for track in self.tracks if self.needs_recognition(track)]
+        for track in due:
+            track.recognized_at = self.frame_index
+            track.score = 1.0
+        self.recognitions += len(due)
+        self.skipped += len(self.tracks) - len(due)
+        return due
+
+    def mark_recognized(self, track, identity):
+        track.identity = identity
+
+    # ---------------- Detection ----------------
+    def _template(self, small, box):
+        x, y, w, h = (int(round(v * TRACK_SCALE)) for v in box)
+        return small[y:y + h, x:x + w].copy()
+
+    def _associate(self, small, detections):
+        detections = [tuple(int(v) for v in box) for box in detections]
+
+        # Greedy IoU association, best overlaps first
+        pairs = sorted(((iou(t.box, d), ti, di) for ti, t in enumerate(self.tracks)
+                        for di, d in enumerate(detections)), reverse=True)
+        matched_tracks, matched_dets = set(), set()
+        for overlap, ti, di in pairs:
+            if overlap < IOU_MATCH:
+                break
+            if ti in matched_tracks or di in matched_dets:
+                continue
+            matched_tracks.add(ti)
+            matched_dets.add(di)
+            track = self.tracks[ti]
+            track.box = detections[di]
+            track.template = self._template(small, track.box)
+            track.misses = 0
+
+        kept = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+                if track.misses > MAX_MISSES:
+                    continue
+            kept.append(track)
+        for di, box in enumerate(detections):
+            if di not in matched_dets:
+                kept.append(Track(box, self._template(small, box), self.smoothing))
+        self.tracks = kept
+
+    # ---------------- Tracking ----------------
+    def _follow(self, small):
+        self.track_frames += 1
+        height, width = small.shape[:2]
+        for track in self.tracks:
+            th, tw = track.template.shape[:2]
+            if th < 4 or tw < 4:
+                self._lost = True
+                continue
+            x, y = (int(round(v * TRACK_SCALE)) for v in track.box[:2])
+            mx, my = int(tw * SEARCH_MARGIN), int(th * SEARCH_MARGIN)
+            x0, y0 = max(0, x - mx), max(0, y - my)
+            x1, y1 = min(width, x + tw + mx), min(height, y + th + my)
+            window = small[y0:y1, x0:x1]
+            if window.shape[0] < th or window.shape[1] < tw:
+                self._lost = True
+                continue
+
+            result = cv2.matchTemplate(window, track.template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (dx, dy) = cv2.minMaxLoc(result)
+            track.score = min(track.score, score)
+            if score < MATCH_THRESHOLD:
+                # Detect on the next frame; the track keeps its last box until then
+                self._lost = True
+                continue
+            _, _, w, h = track.box
+            track.box = (int(round((x0 + dx) / TRACK_SCALE)), int(round((y0 + dy) / TRACK_SCALE)), w, h)
+
+    def stats(self):
+        return {
+            "detect_frames": self.detect_frames,
+            "track_frames": self.track_frames,
+            "tracks": len(self.tracks),
+            "recognitions": self.recognitions,
+            "skipped": self.skipped,
+        }
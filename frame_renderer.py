@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+# --------------------- CONFIG ---------------------
+DISPLAY_SIZE = (640, 480)
+
+
+def _new_image(size):
+    """An RGB image in a single memory block, which PhotoImage.paste() copies without converting."""
+    new_block = getattr(Image.core, "new_block", None)
+    if new_block is None:
+        return Image.new("RGB", size)
+    return Image.new("RGB", (1, 1))._new(new_block("RGB", size))
+
+
+class FrameRenderer:
+    """
+    Draws the recognition boxes on camera frames and shows them in a Tk
+    label, allocating nothing per frame.
+
+    The frame is copied into one preallocated BGR buffer for drawing,
+    resized into it only when the camera delivers another size. That buffer
+    is unpacked into one persistent RGB image, which swaps BGR to RGB in
+    the same pass, and the image is pasted into one persistent PhotoImage
+    the label keeps showing.
+    """
+
+    def __init__(self, size=DISPLAY_SIZE):
+        self.size = size
+        width, height = size
+        self.canvas = np.empty((height, width, 3), np.uint8)
+        self.image = _new_image(size)
+        self.photo = None
+
+    def draw(self, frame, detected_faces):
+        """The frame with its face boxes, as the persistent RGB image."""
+        height, width = frame.shape[:2]
+        if (width, height) == self.size:
+            np.copyto(self.canvas, frame)
+            sx = sy = 1.0
+        else:
+            cv2.resize(frame, self.size, dst=self.canvas)
+            sx, sy = self.size[0] / width, self.size[1] / height
+
+        for (x, y, w, h, name, _, _) in detected_faces:
+            color = (0,255,0) if name != "Unknown" else (0,0,255)
+            x0, y0 = int(x * sx), int(y * sy)
+            x1, y1 = int((x + w) * sx), int((y + h) * sy)
+            cv2.rectangle(self.canvas, (x0, y0), (x1, y1), color, 2)
+            cv2.putText(self.canvas, name, (x0, y0-10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+        self.image.frombytes(self.canvas, "raw", "BGR")
+        return self.image
+
+    def show(self, label, frame, detected_faces):
+        """Draw the frame and display it in `label`."""
+        image = self.draw(frame, detected_faces)
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(image)
+            label.config(image=self.photo)
+        else:
+            # Tk redraws the label from the updated photo; no new image object
+            self.photo.paste(image)
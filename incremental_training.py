@@ -0,0 +1,68 @@
+import json
+import os
+
+# --------------------- CONFIG ---------------------
+STATE_FILE = "trainer_state.json"
+
+
+# -----------------------------
+# Training State
+# -----------------------------
+def load_state(state_file=STATE_FILE):
+    """
+    Return {"samples": {img_path: [sha1, label]}, "prototypes": n} for the
+    current model, or None when there is no usable state.
+    """
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) and "samples" in state else None
+
+
+def save_state(samples, prototypes=0, state_file=STATE_FILE):
+    with open(state_file, "w") as f:
+        json.dump({"samples": samples, "prototypes": prototypes}, f)
+
+
+# -----------------------------
+# Full vs Incremental
+# -----------------------------
+def plan_training(state, current, prototypes=0):
+    """
+    Compare the samples baked into the existing model (`state` from
+    load_state()) with the current ones ({img_path: [sha1, label]}) and
+    decide how to train.
+
+    Returns (mode, new_paths, reason) where mode is "full", "update" or
+    "noop". LBPH can append samples but never forget them, so any trained
+    image that was deleted, edited or relabelled forces a full rebuild.
+    With prototype compaction (`prototypes` per label), new images for a
+    student already in the model also need a rebuild, since that student's
+    prototypes have to be chosen again.
+    """
+    if state is None:
+        return "full", list(current), "no previous training state"
+    if state.get("prototypes", 0) != prototypes:
+        return "full", list(current), "prototype count changed"
+
+    trained = state["samples"]
+
+    for path, fingerprint in trained.items():
+        if path not in current:
+            return "full", list(current), f"{os.path.basename(os.path.dirname(path))} changed or was deleted"
+        if list(current[path]) != list(fingerprint):
+            return "full", list(current), f"{os.path.basename(path)} was modified"
+
+    new_paths = [path for path in current if path not in trained]
+    if not new_paths:
+        return "noop", [], "model already up to date"
+    if prototypes:
+        trained_labels = {label for _, label in trained.values()}
+        for path in new_paths:
+            if current[path][1] in trained_labels:
+                return "full", list(current), f"new images for {os.path.basename(os.path.dirname(path))}"
+    return "update", new_paths, f"{len(new_paths)} new images"
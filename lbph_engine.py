@@ -0,0 +1,243 @@
+import math
+import numpy as np
+
+# --------------------- CONFIG ---------------------
+BLOCK_ROWS = 16             # training histograms per vectorised block (stays in cache)
+EXACT_BATCH = 32            # candidates refined per step
+EXACT_STEP = 4              # candidates re-scored exactly at a time
+BOUND_SLACK = 1e-4          # relative float32 error allowed for when pruning
+CELL_POOL = 2               # grid cells merged per side for the first-pass bound
+
+_FLT_EPSILON = np.finfo(np.float32).eps
+_DBL_EPSILON = np.finfo(np.float64).eps
+
+
+# ----------------------------- LBP FEATURES -----------------------------
+def elbp(src, radius=1, neighbors=8):
+    """
+    Extended (circular) local binary patterns of a uint8 image, computed
+    exactly as OpenCV's LBPHFaceRecognizer does: bilinear sampling in
+    float32 and one bit per neighbour.
+    """
+    src_f = src.astype(np.float32)
+    rows, cols = src.shape
+    h, w = rows - 2 * radius, cols - 2 * radius
+    center = src_f[radius:radius + h, radius:radius + w]
+    dst = np.zeros((h, w), np.int32)
+
+    def shifted(dy, dx):
+        return src_f[radius + dy:radius + dy + h, radius + dx:radius + dx + w]
+
+    for n in range(neighbors):
+        x = np.float32(radius * math.cos(2.0 * math.pi * n / float(np.float32(neighbors))))
+        y = np.float32(-radius * math.sin(2.0 * math.pi * n / float(np.float32(neighbors))))
+        fx, fy = int(math.floor(x)), int(math.floor(y))
+        cx, cy = int(math.ceil(x)), int(math.ceil(y))
+        ty = np.float32(y - np.float32(fy))
+        tx = np.float32(x - np.float32(fx))
+        w1 = np.float32((np.float32(1) - tx) * (np.float32(1) - ty))
+        w2 = np.float32(tx * (np.float32(1) - ty))
+        w3 = np.float32((np.float32(1) - tx) * ty)
+        w4 = np.float32(tx * ty)
+
+        t = w1 * shifted(fy, fx) + w2 * shifted(fy, cx) + w3 * shifted(cy, fx) + w4 * shifted(cy, cx)
+        bit = (t > center) | (np.abs(t - center) < _FLT_EPSILON)
+        dst += bit.astype(np.int32) << n
+    return dst
+
+
+def uniform_pattern_map(neighbors=8):
+    """
+    Map every LBP code to its "uniform" group: one group per pattern with at
+    most two 0/1 transitions, plus one shared group for all the others.
+    """
+    num_patterns = 2 ** neighbors
+    groups = {}
+    mapping = np.empty(num_patterns, np.int64)
+    for code in range(num_patterns):
+        bits = [(code >> i) & 1 for i in range(neighbors)]
+        transitions = sum(bits[i] != bits[(i + 1) % neighbors] for i in range(neighbors))
+        if transitions <= 2:
+            mapping[code] = groups.setdefault(code, len(groups))
+        else:
+            mapping[code] = -1
+    mapping[mapping == -1] = len(groups)
+    return mapping, len(groups) + 1
+
+
+def chi_square_blocks(histograms, queries):
+    """
+    float32 HISTCMP_CHISQR_ALT distances, shape (len(queries), len(histograms)).
+    Works through the matrix in small row blocks so every temporary stays in
+    cache; used for the pruning bound, not for the returned distances.
+    """
+    tiny = np.float32(1e-30)
+    out = np.empty((len(queries), len(histograms)), np.float32)
+    q = queries[None, :, :]
+    for start in range(0, len(histograms), BLOCK_ROWS):
+        h = histograms[start:start + BLOCK_ROWS, None, :]
+        diff = h - q
+        np.multiply(diff, diff, out=diff)
+        total = h + q
+        total += tiny
+        np.divide(diff, total, out=diff)
+        out[:, start:start + BLOCK_ROWS] = 2 * diff.sum(axis=2).T
+    return out
+
+
+def spatial_histogram(lbp, num_patterns=256, grid_x=8, grid_y=8):
+    """Concatenated, per-cell normalised pattern histograms (float32, 1-D)."""
+    height = lbp.shape[0] // grid_y
+    width = lbp.shape[1] // grid_x
+    # Crop to whole cells and give every pixel a (cell, pattern) bin index
+    cells = lbp[:grid_y * height, :grid_x * width].reshape(grid_y, height, grid_x, width)
+    cell_index = (np.arange(grid_y)[:, None, None, None] * grid_x +
+                  np.arange(grid_x)[None, None, :, None])
+    bins = (cell_index * num_patterns + cells).ravel()
+    counts = np.bincount(bins, minlength=grid_x * grid_y * num_patterns).astype(np.float32)
+    return counts * np.float32(1.0 / (height * width))
+
+
+def _cell_pool(grid_x, grid_y):
+    return CELL_POOL if grid_x % CELL_POOL == 0 and grid_y % CELL_POOL == 0 else 1
+
+
+def level_dims(neighbors=8, grid_x=8, grid_y=8):
+    """Row length of each of LBPHEngine's coarse levels, coarsest first."""
+    groups = uniform_pattern_map(neighbors)[1]
+    cells = grid_x * grid_y
+    return [cells // _cell_pool(grid_x, grid_y) ** 2 * groups, cells * groups]
+
+
+# ----------------------------- ENGINE -----------------------------
+class LBPHEngine:
+    """
+    Nearest-neighbour LBPH recognizer over a contiguous float32 matrix of
+    training histograms.
+
+    `predict_batch()` scores all faces of a frame together. Merging histogram
+    bins can only shrink a chi-square distance, so coarse copies of the
+    matrix give lower bounds: each cell's 256 patterns merged into 59
+    uniform groups, and those groups pooled over blocks of CELL_POOL x
+    CELL_POOL cells. Every row is scanned at the coarsest level. Candidates
+    are then refined best bound first, and refinement stops once no
+    remaining bound can beat the best exact distance. The result is the same
+    (label, distance) pair as cv2.face.LBPHFaceRecognizer.predict(), up to
+    floating-point summation order, while most full-resolution comparisons
+    are skipped.
+    """
+
+    def __init__(self, histograms, labels, radius=1, neighbors=8, grid_x=8, grid_y=8,
+                 threshold=float("inf"), levels=None):
+        self.histograms = np.ascontiguousarray(histograms, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.int32).ravel()
+        self.radius = radius
+        self.neighbors = neighbors
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.threshold = threshold
+
+        # One-hot (patterns x groups) matrix for the uniform merge
+        mapping, self._groups = uniform_pattern_map(neighbors)
+        self._merge = np.zeros((2 ** neighbors, self._groups), np.float32)
+        self._merge[np.arange(2 ** neighbors), mapping] = 1
+        self._pool = _cell_pool(grid_x, grid_y)
+        # Precomputed levels (mapped from the model file) skip a full pass over the matrix
+        self.levels = self.coarsen(self.histograms) if levels is None else list(levels)
+
+    @classmethod
+    def from_recognizer(cls, recognizer):
+        """Extract the histograms of a trained cv2.face LBPH recognizer once."""
+        histograms = recognizer.getHistograms()
+        dim = histograms[0].size if len(histograms) else 0
+        matrix = np.empty((len(histograms), dim), np.float32)
+        for i, hist in enumerate(histograms):
+            matrix[i] = hist.ravel()
+        return cls(matrix, recognizer.getLabels(),
+                   radius=recognizer.getRadius(), neighbors=recognizer.getNeighbors(),
+                   grid_x=recognizer.getGridX(), grid_y=recognizer.getGridY(),
+                   threshold=recognizer.getThreshold())
+
+    def __len__(self):
+        return len(self.labels)
+
+    def histogram(self, face):
+        lbp = elbp(face, self.radius, self.neighbors)
+        return spatial_histogram(lbp, 2 ** self.neighbors, self.grid_x, self.grid_y)
+
+    def coarsen(self, histograms):
+        """Merged copies of `histograms`, one per level, coarsest first."""
+        n, pool = len(histograms), self._pool
+        uniform = (histograms.reshape(-1, 2 ** self.neighbors) @ self._merge)
+        pooled = uniform.reshape(n, self.grid_y // pool, pool, self.grid_x // pool, pool, self._groups)
+        pooled = pooled.sum(axis=(2, 4))
+        cells = self.grid_x * self.grid_y
+        return [np.ascontiguousarray(pooled.reshape(n, cells // pool ** 2 * self._groups)),
+                uniform.reshape(n, cells * self._groups)]
+
+    def distances(self, queries, rows=None):
+        """
+        Exact chi-square (HISTCMP_CHISQR_ALT) distances from each query to the
+        training histograms in `rows` (all of them by default), computed like
+        cv::compareHist: float32 difference and sum, double accumulation.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        histograms = self.histograms if rows is None else self.histograms[rows]
+        out = np.empty((len(queries), len(histograms)), np.float64)
+        for start in range(0, len(histograms), BLOCK_ROWS):
+            block = histograms[start:start + BLOCK_ROWS, None, :]
+            a = (block - queries[None, :, :]).astype(np.float64)
+            b = (block + queries[None, :, :]).astype(np.float64)
+            np.multiply(a, a, out=a)
+            valid = np.abs(b) > _DBL_EPSILON
+            np.divide(a, b, out=a, where=valid)
+            a[~valid] = 0
+            out[:, start:start + BLOCK_ROWS] = 2 * a.sum(axis=2).T
+        return out
+
+    def _nearest(self, query, query_levels, bounds):
+        """Exact nearest neighbour of one query, visiting rows by lower bound."""
+        best_dist, best_idx = self.threshold, -1
+        bounds = bounds.astype(np.float64) * (1 - BOUND_SLACK)
+        order = np.argsort(bounds, kind="stable")
+        for start in range(0, len(order), EXACT_BATCH):
+            rows = order[start:start + EXACT_BATCH]
+            rows = rows[bounds[rows] <= best_dist]
+            if len(rows) == 0:
+                break
+            # Tighter bounds from the finer levels before the full comparison
+            for level, query_level in zip(self.levels[1:], query_levels[1:]):
+                finer = chi_square_blocks(level[rows], query_level[None])[0].astype(np.float64)
+                finer *= 1 - BOUND_SLACK
+                keep = finer <= best_dist
+                rows, finer = rows[keep], finer[keep]
+            by_bound = np.argsort(finer, kind="stable")
+            rows, finer = rows[by_bound], finer[by_bound]
+            for step in range(0, len(rows), EXACT_STEP):
+                if finer[step] > best_dist:
+                    break
+                chunk = rows[step:step + EXACT_STEP]
+                exact = self.distances(query[None], chunk)[0]
+                for idx, dist in zip(chunk, exact):
+                    # OpenCV keeps the first (lowest index) sample on exact ties
+                    if dist < best_dist or (dist == best_dist and best_idx != -1 and idx < best_idx):
+                        best_dist, best_idx = dist, idx
+        if best_idx == -1:
+            return -1, float(np.finfo(np.float64).max)
+        return int(self.labels[best_idx]), float(best_dist)
+
+    def predict_batch(self, faces):
+        """Return [(label, distance)] for a list of preprocessed face crops."""
+        if not len(faces):
+            return []
+        if len(self) == 0:
+            return [(-1, float(np.finfo(np.float64).max))] * len(faces)
+
+        queries = np.stack([self.histogram(face) for face in faces])
+        query_levels = self.coarsen(queries)
+        bounds = chi_square_blocks(self.levels[0], query_levels[0])
+        return [self._nearest(query, [level[i] for level in query_levels], bounds[i])
+                for i, query in enumerate(queries)]
+
+    def predict(self, face):
+        return self.predict_batch([face])[0]
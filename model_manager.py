@@ -0,0 +1,224 @@
+import glob
+import os
+import shutil
+import threading
+import time
+import cv2
+from face_cache import file_sha1
+from model_store import MODEL_BIN, MODEL_FILE, ensure_binary, load_model
+
+# --------------------- CONFIG ---------------------
+CHECK_INTERVAL = 2.0      # seconds between model file stat() checks
+USE_NUMPY_ENGINE = True   # serve lbph_engine (binary model) instead of cv2 + trainer.yml
+SNAPSHOT_DIR = "model_snapshots"
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_index(index):
+    """(signature, sha1) recorded by _write_index(), or None."""
+    try:
+        with open(index) as f:
+            mtime_ns, size, digest = f.read().split()
+        return (int(mtime_ns), int(size)), digest
+    except (OSError, ValueError):
+        return None
+
+
+def _write_index(index, signature, digest):
+    temp = f"{index}.{os.getpid()}"
+    try:
+        with open(temp, "w") as f:
+            f.write(f"{signature[0]} {signature[1]} {digest}\n")
+        os.replace(temp, index)
+    except OSError as e:
+        print(f"[ERROR] Could not write model snapshot index: {e}")
+
+
+class ModelManager:
+    """
+    Keeps the trained recognizer resident across scans and windows.
+
+    `get()` is a plain attribute read once the model is loaded. A watcher
+    thread (`start()`) stat()s the model file every CHECK_INTERVAL seconds;
+    when its mtime or size changes, the new model is loaded completely on
+    that thread and then swapped in with a single assignment, so frames in
+    flight finish on the old model and none wait for the new one. The file
+    is hashed first and an identical model is not reloaded. A failed
+    reload keeps serving the previous model.
+
+    The binary model is memory-mapped from a content-addressed copy in
+    SNAPSHOT_DIR, never from trainer.lbph itself: Windows refuses to
+    replace a mapped file, which would block training from saving. A
+    model file is copied and hashed only by the first process to see its
+    mtime and size: SNAPSHOT_DIR keeps an index from that signature to the
+    snapshot, so other camera processes and later startups map the
+    existing snapshot without reading the file. The histogram matrix and
+    its coarse levels are mapped, not copied, so processes that load the
+    same model share those pages through the OS page cache.
+
+    Also records time to first recognition: from `scan_started()` (button
+    or ultrasonic trigger) to the first accepted face in `recognized()`.
+    """
+
+    def __init__(self, bin_file=MODEL_BIN, yml_file=MODEL_FILE, use_engine=USE_NUMPY_ENGINE):
+        self.bin_file = bin_file
+        self.yml_file = yml_file
+        self.use_engine = use_engine
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.first_recognition = None
+        self._model = None
+        self._digest = None
+        self._signature = None
+        self._scan_started = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    # ---------------- Loading ----------------
+    @property
+    def source(self):
+        return self.bin_file if self.use_engine else self.yml_file
+
+    def _snapshot(self, signature):
+        """
+        Snapshot of the binary model in SNAPSHOT_DIR; returns (snapshot, sha1).
+        The file is only copied and hashed when `signature` is not the one
+        in the index.
+        """
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        root, ext = os.path.splitext(os.path.basename(self.bin_file))
+        index = os.path.join(SNAPSHOT_DIR, f"{root}.index")
+        known = _read_index(index)
+        if signature is not None and known is not None and known[0] == signature:
+            snapshot = os.path.join(SNAPSHOT_DIR, f"{root}-{known[1][:16]}{ext}")
+            if os.path.exists(snapshot):
+                return snapshot, known[1]
+
+        # Hash the copy, not the source, which training may replace meanwhile.
+        # Per-process name: every camera process of multi_camera.py snapshots too
+        incoming = os.path.join(SNAPSHOT_DIR, f"{root}.{os.getpid()}.incoming")
+        shutil.copyfile(self.bin_file, incoming)
+        digest = file_sha1(incoming)
+        snapshot = os.path.join(SNAPSHOT_DIR, f"{root}-{digest[:16]}{ext}")
+        if os.path.exists(snapshot):
+            os.remove(incoming)
+        else:
+            # Identical content, so a concurrent replace by another process is harmless
+            os.replace(incoming, snapshot)
+        # Only if training did not replace the file during the copy
+        if signature is not None and _stat(self.bin_file) == signature:
+            _write_index(index, signature, digest)
+        return snapshot, digest
+
+    def _remove_old_snapshots(self, keep):
+        # Snapshots still mapped (Windows) are left for a later swap; the
+        # pattern spares other processes' .incoming copies
+        root, ext = os.path.splitext(os.path.basename(self.bin_file))
+        for old in glob.glob(os.path.join(SNAPSHOT_DIR, f"{root}-*{ext}")):
+            if os.path.abspath(old) != os.path.abspath(keep):
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+    def _load(self):
+        """Load the model file if its content changed. Caller holds the lock."""
+        if self.use_engine and self._model is None:
+            ensure_binary(self.bin_file, self.yml_file)
+        signature = _stat(self.source)
+        if self.use_engine:
+            path, digest = self._snapshot(signature)
+        else:
+            path, digest = self.yml_file, file_sha1(self.yml_file)
+
+        if digest != self._digest:
+            start = time.perf_counter()
+            if self.use_engine:
+                model = load_model(path)
+            else:
+                model = cv2.face.LBPHFaceRecognizer_create()
+                model.read(path)
+            self.load_seconds = time.perf_counter() - start
+            self.loads += 1
+            # The swap: workers pick up the new model on their next get()
+            self._model, self._digest = model, digest
+            print(f"[INFO] Model loaded from {self.source} in {self.load_seconds:.2f}s")
+        if self.use_engine:
+            self._remove_old_snapshots(path)
+        self._signature = signature
+
+    def get(self):
+        """Return the resident model, loading it on first use."""
+        model = self._model
+        if model is None:
+            with self._lock:
+                if self._model is None:
+                    self._load()
+                model = self._model
+        return model
+
+    def refresh(self):
+        """Reload if the model file changed since the last load."""
+        if _stat(self.source) == self._signature:
+            return
+        with self._lock:
+            try:
+                self._load()
+            except Exception as e:
+                print(f"[ERROR] Could not reload model, keeping the previous one: {e}")
+                self._signature = _stat(self.source)
+
+    # ---------------- Watcher ----------------
+    def _watch(self):
+        if os.path.exists(self.source) or os.path.exists(self.yml_file):
+            try:
+                self.get()
+            except Exception as e:
+                print(f"[ERROR] Could not preload model: {e}")
+        # Also picks up the first model trained while the window is open
+        while not self._stop.wait(CHECK_INTERVAL):
+            self.refresh()
+
+    def start(self):
+        """Preload the model and watch for retrained ones in the background."""
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ---------------- Time To First Recognition ----------------
+    def scan_started(self):
+        if self._scan_started is None:
+            self._scan_started = time.perf_counter()
+
+    def scan_stopped(self):
+        self._scan_started = None
+
+    def recognized(self):
+        started = self._scan_started
+        if started is not None:
+            self._scan_started = None
+            self.first_recognition = time.perf_counter() - started
+            print(f"[INFO] First recognition {self.first_recognition * 1000:.0f} ms after scan start")
+
+    def stats(self):
+        return {
+            "loads": self.loads,
+            "load_seconds": self.load_seconds,
+            "first_recognition": self.first_recognition,
+        }
+
+
+# Shared by every recognition window, so the model outlives them
+model_manager = ModelManager()
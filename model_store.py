@@ -0,0 +1,153 @@
+import os
+import struct
+import sys
+import cv2
+import numpy as np
+from lbph_engine import LBPHEngine, level_dims
+
+# --------------------- CONFIG ---------------------
+MODEL_FILE = "trainer.yml"
+MODEL_BIN = "trainer.lbph"
+
+# magic, version, radius, neighbors, grid_x, grid_y, count, dim, threshold
+MAGIC = b"LBPHBIN\0"
+FORMAT_VERSION = 2   # 2 adds the engine's coarse levels after the matrix
+HEADER = struct.Struct("<8sIiiiiqqd")
+ALIGN = 64   # labels, histograms and levels start on cache-line boundaries
+
+
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _layout(count, dim, level_dims=()):
+    """Byte offsets of the label array, the histogram matrix and each coarse level."""
+    labels_at = _aligned(HEADER.size)
+    matrix_at = _aligned(labels_at + 4 * count)
+    levels_at = []
+    offset = matrix_at + 4 * count * dim
+    for level_dim in level_dims:
+        offset = _aligned(offset)
+        levels_at.append(offset)
+        offset += 4 * count * level_dim
+    return labels_at, matrix_at, levels_at
+
+
+# -----------------------------
+# Write
+# -----------------------------
+def save_model(path, histograms, labels, radius=1, neighbors=8, grid_x=8, grid_y=8,
+               threshold=float("inf")):
+    """
+    Write the binary model: a fixed header, int32 labels, a row-major
+    float32 histogram matrix and the engine's coarse levels of it, so
+    loading maps them instead of recomputing them. Written to a temporary
+    file and renamed, so a reader never sees a half-written model.
+    """
+    engine = LBPHEngine(histograms, labels, radius, neighbors, grid_x, grid_y, threshold)
+    histograms, labels = engine.histograms, engine.labels
+    count = len(labels)
+    dim = histograms.shape[1] if count else 0
+    labels_at, matrix_at, levels_at = _layout(count, dim, level_dims(neighbors, grid_x, grid_y))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, radius, neighbors, grid_x, grid_y,
+                            count, dim, threshold))
+        f.seek(labels_at)
+        f.write(labels.tobytes())
+        f.seek(matrix_at)
+        f.write(histograms.tobytes())
+        for level_at, level in zip(levels_at, engine.levels):
+            f.seek(level_at)
+            f.write(np.ascontiguousarray(level, dtype=np.float32).tobytes())
+    os.replace(tmp_path, path)
+
+
+def save_recognizer(recognizer, path=MODEL_BIN):
+    """Write a trained cv2.face LBPH recognizer in the binary format."""
+    engine = LBPHEngine.from_recognizer(recognizer)
+    save_model(path, engine.histograms, engine.labels, engine.radius, engine.neighbors,
+               engine.grid_x, engine.grid_y, engine.threshold)
+
+
+def save_yml(recognizer, path=MODEL_FILE):
+    """recognizer.save() through a temporary file and an atomic rename."""
+    root, ext = os.path.splitext(path)
+    # OpenCV picks the format from the extension, so keep it last
+    tmp_path = f"{root}.tmp{ext}"
+    recognizer.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def convert_yml(yml_file=MODEL_FILE, bin_file=MODEL_BIN):
+    recognizer = cv2.face.LBPHFaceRecognizer_create()
+    recognizer.read(yml_file)
+    save_recognizer(recognizer, bin_file)
+
+
+# -----------------------------
+# Read
+# -----------------------------
+def load_model(path=MODEL_BIN):
+    """
+    Open a binary model as an LBPHEngine. The histogram matrix and its
+    coarse levels are memory mapped rather than parsed or recomputed, so
+    only the pages that are touched are read, and processes mapping the
+    same file share them. Version 1 files (no levels) still load, with the
+    levels computed, which reads the whole matrix.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not an LBPH model file")
+    magic, version, radius, neighbors, grid_x, grid_y, count, dim, threshold = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an LBPH model file")
+    if version not in (1, FORMAT_VERSION):
+        raise ValueError(f"{path} has unsupported model format version {version}")
+
+    if count == 0:
+        histograms = np.empty((0, dim), np.float32)
+        labels = np.empty(0, np.int32)
+        return LBPHEngine(histograms, labels, radius, neighbors, grid_x, grid_y, threshold)
+
+    dims = level_dims(neighbors, grid_x, grid_y) if version >= 2 else []
+    labels_at, matrix_at, levels_at = _layout(count, dim, dims)
+    labels = np.memmap(path, dtype=np.int32, mode="r", offset=labels_at, shape=(count,))
+    histograms = np.memmap(path, dtype=np.float32, mode="r", offset=matrix_at, shape=(count, dim))
+    levels = [np.memmap(path, dtype=np.float32, mode="r", offset=at, shape=(count, level_dim))
+              for at, level_dim in zip(levels_at, dims)] or None
+    return LBPHEngine(histograms, labels, radius, neighbors, grid_x, grid_y, threshold, levels)
+
+
+def _file_version(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    return HEADER.unpack(header)[1] if len(header) == HEADER.size else None
+
+
+def ensure_binary(bin_file=MODEL_BIN, yml_file=MODEL_FILE):
+    """
+    Convert trainer.yml if the binary file is missing, older (e.g. a
+    model trained before this format existed) or an older format version.
+    """
+    if os.path.exists(yml_file) and (not os.path.exists(bin_file) or
+                                     os.path.getmtime(bin_file) < os.path.getmtime(yml_file) or
+                                     _file_version(bin_file) != FORMAT_VERSION):
+        print(f"[INFO] Converting {yml_file} to {bin_file}")
+        convert_yml(yml_file, bin_file)
+
+
+def load_engine(bin_file=MODEL_BIN, yml_file=MODEL_FILE):
+    ensure_binary(bin_file, yml_file)
+    return load_model(bin_file)
+
+
+# ----------------------------- Run Directly -----------------------------
+if __name__ == "__main__":
+    # python model_store.py [trainer.yml] [trainer.lbph]
+    src = sys.argv[1] if len(sys.argv) > 1 else MODEL_FILE
+    dst = sys.argv[2] if len(sys.argv) > 2 else MODEL_BIN
+    convert_yml(src, dst)
+    print(f"[INFO] Wrote {dst} ({os.path.getsize(dst) / 1e6:.1f} MB) from {src}")
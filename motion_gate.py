@@ -0,0 +1,73 @@
+import time
+import cv2
+import numpy as np
+
+# --------------------- CONFIG ---------------------
+GATE_WIDTH = 80           # frames are compared at this width
+PIXEL_THRESHOLD = 25      # grey-level change that counts a pixel as moving
+MOTION_FRACTION = 0.005   # share of moving pixels that wakes recognition
+MOTION_HOLD = 2.0         # seconds recognition stays awake after motion or a face
+BACKGROUND_RATE = 0.05    # how fast the background follows slow lighting changes
+
+
+class MotionGate:
+    """
+    Cheap motion check that decides whether a frame is worth detecting on.
+
+    Each frame is shrunk to GATE_WIDTH pixels, blurred and compared with a
+    running-average background; enough changed pixels count as motion.
+    `check(frame)` returns True while there was motion in the last `hold`
+    seconds, and `wake()` (called when a face is seen) extends that, so a
+    person standing still at the door keeps being recognised.
+    """
+
+    def __init__(self, width=GATE_WIDTH, threshold=PIXEL_THRESHOLD,
+                 fraction=MOTION_FRACTION, hold=MOTION_HOLD, rate=BACKGROUND_RATE):
+        self.width = width
+        self.threshold = threshold
+        self.fraction = fraction
+        self.hold = hold
+        self.rate = rate
+        self.frames = 0
+        self.skipped = 0
+        self._background = None
+        self._awake_until = 0.0
+
+    def wake(self):
+        self._awake_until = time.perf_counter() + self.hold
+
+    def reset(self):
+        self._background = None
+        self._awake_until = 0.0
+
+    def moving(self, frame):
+        """Whether `frame` (BGR or gray) differs enough from the background."""
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, int(round(height * self.width / width))))
+        # Shrink first: the colour conversion and blur then touch a few thousand pixels
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+
+        if self._background is None or self._background.shape != small.shape:
+            self._background = small.astype(np.float32)
+            return True
+        diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(small, self._background, self.rate)
+        changed = cv2.countNonZero(cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)[1])
+        return changed > self.fraction * diff.size
+
+    def check(self, frame):
+        """Whether to run detection on `frame`."""
+        self.frames += 1
+        if self.moving(frame):
+            self.wake()
+        if time.perf_counter() < self._awake_until:
+            return True
+        self.skipped += 1
+        return False
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.frames if self.frames else 0.0
@@ -0,0 +1,132 @@
+import argparse
+import multiprocessing
+import queue
+import signal
+import time
+import cv2
+from attendance_writer import attendance_writer
+from door import unlock_door_with_lcd
+from model_manager import model_manager
+from motion_gate import MotionGate
+from recognition_session import COOLDOWN, RecognitionSession
+from settings_interface import camera_sources
+
+# --------------------- CONFIG ---------------------
+RECONNECT_DELAY = 2.0     # seconds before reopening a camera that stopped delivering
+EVENT_POLL = 0.5          # seconds the parent waits for an attendance event
+
+
+# ---------------- Camera Process ----------------
+def camera_worker(index, source, events, stop):
+    """
+    Capture and recognition for one camera, in its own process.
+    Recognised students are sent to the parent as
+    (camera index, name, student_id, department) and never written here.
+    """
+    # Ctrl+C reaches the whole process group; the parent decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # One core per camera: OpenCV's own thread pool would fight the other processes
+    cv2.setNumThreads(1)
+
+    # Maps the same model snapshot as the other cameras; retrains are picked up too
+    model_manager.start()
+    while not stop.is_set():
+        try:
+            model_manager.get()
+            break
+        except Exception as e:
+            print(f"[ERROR] Camera {index}: no model yet ({e}), retrying")
+            stop.wait(RECONNECT_DELAY * 5)
+    session = RecognitionSession(lambda name, student_id, dept: events.put((index, name, student_id, dept)))
+    # An empty doorway costs a downscaled frame difference, not a cascade run
+    gate = MotionGate()
+
+    seq = 0
+    while not stop.is_set():
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            print(f"[ERROR] Camera {index} ({source}) could not be opened, retrying")
+            stop.wait(RECONNECT_DELAY)
+            continue
+        cap.set(3, 640)
+        cap.set(4, 480)
+        print(f"[INFO] Camera {index} ({source}) running")
+
+        while not stop.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                print(f"[ERROR] Camera {index} ({source}) stopped delivering frames")
+                break
+            seq += 1
+            if not gate.check(frame):
+                continue
+            try:
+                if session.process(frame, seq):
+                    gate.wake()
+            except Exception as e:
+                print(f"[ERROR] Camera {index}: {e}")
+        cap.release()
+        session.reset()
+        gate.reset()
+        print(f"[INFO] Camera {index}: motion gate skipped {gate.skip_ratio:.0%} of frames")
+        stop.wait(RECONNECT_DELAY)
+
+    model_manager.stop()
+
+
+# ---------------- Parent Process ----------------
+def run(sources, unlock_door=True):
+    """
+    One process per camera source; attendance from all of them goes through
+    the single attendance_writer in this process, so SQLite has one writer.
+    Runs until Ctrl+C.
+    """
+    # spawn on every platform: forked OpenCV/threads state is not safe to reuse
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    stop = ctx.Event()
+    workers = [ctx.Process(target=camera_worker, args=(index, source, events, stop),
+                           name=f"camera-{index}", daemon=True)
+               for index, source in enumerate(sources)]
+    for worker in workers:
+        worker.start()
+    print(f"[INFO] {len(workers)} camera process(es) started")
+
+    last_logged = {}
+    try:
+        while any(worker.is_alive() for worker in workers):
+            try:
+                index, name, student_id, dept = events.get(timeout=EVENT_POLL)
+            except queue.Empty:
+                continue
+            # Each camera applies its own cooldown; this one spans cameras
+            now = time.time()
+            if now - last_logged.get(student_id, 0) <= COOLDOWN:
+                continue
+            last_logged[student_id] = now
+            print(f"[INFO] Camera {index}: {name} ({student_id})")
+            attendance_writer.submit(name, student_id, dept)
+            if unlock_door:
+                # Only queued; the shared serial link writes it
+                unlock_door_with_lcd(name, student_id, 5)
+    except KeyboardInterrupt:
+        print("[INFO] Stopping cameras")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        attendance_writer.close()
+
+
+if __name__ == "__main__":
+    # python multi_camera.py [--sources 0 1 rtsp://...] [--no-door]
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Headless attendance with one process per camera.")
+    parser.add_argument("--sources", nargs="+", help="camera sources (default: camera_source in settings.json)")
+    parser.add_argument("--no-door", action="store_true", help="log attendance without unlocking the door")
+    args = parser.parse_args()
+
+    sources = camera_sources({"camera_source": args.sources}) if args.sources else camera_sources()
+    run(sources, unlock_door=not args.no_door)
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+import time
+
+DB_FILE = "profiles.db"
+
+# --------------------- CONFIG ---------------------
+RECHECK_INTERVAL = 2.0    # seconds between profiles.db stat() checks on lookups
+
+
+def _stat(path):
+    # The WAL file changes before the database file itself does
+    signature = []
+    for name in (path, path + "-wal"):
+        try:
+            st = os.stat(name)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class ProfileCache:
+    """
+    In-memory copy of the `profiles` table keyed by student_id.
+
+    The table is read once on first use; writers in this process call
+    `invalidate()` so the next lookup reloads it. Other processes
+    (multi_camera.py workers, the viewer) never see those calls, so
+    lookups, hits included, also stat() profiles.db at most every
+    RECHECK_INTERVAL seconds and reload when it changed since the last load
+    or that load failed, like ModelManager.refresh() does: a renamed or
+    deleted profile stops being returned within that interval. Between
+    checks a lookup is a plain dict read.
+    """
+
+    def __init__(self, db_file=DB_FILE):
+        self.db_file = db_file
+        self.hits = 0
+        self.misses = 0
+        self._profiles = None
+        self._signature = None
+        self._failed = False
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read the table. Caller holds the lock."""
+        self._signature = _stat(self.db_file)
+        self._checked = time.monotonic()
+        self._failed = False
+        profiles = {}
+        try:
+            conn = sqlite3.connect(self.db_file)
+            cursor = conn.cursor()
+            cursor.execute("SELECT student_id, name, department FROM profiles")
+            for student_id, name, department in cursor.fetchall():
+                profiles[str(student_id)] = (name, department)
+            conn.close()
+        except sqlite3.Error as e:
+            self._failed = True
+            print(f"[ERROR] Could not load profiles: {e}")
+        return profiles
+
+    def _refresh(self):
+        """The reloaded table if profiles.db changed or the last load failed, else None."""
+        if time.monotonic() - self._checked < RECHECK_INTERVAL:
+            return None
+        with self._lock:
+            if time.monotonic() - self._checked < RECHECK_INTERVAL:
+                return None
+            self._checked = time.monotonic()
+            if not self._failed and _stat(self.db_file) == self._signature:
+                return None
+            self._profiles = self._load()
+            return self._profiles
+
+    def get(self, student_id):
+        """Return (name, department) or (None, None) for an unknown student."""
+        profiles = self._profiles
+        if profiles is None:
+            with self._lock:
+                if self._profiles is None:
+                    self._profiles = self._load()
+                profiles = self._profiles
+        else:
+            # An empty table is a valid reload, so compare with None
+            reloaded = self._refresh()
+            if reloaded is not None:
+                profiles = reloaded
+
+        row = profiles.get(str(student_id))
+        if row:
+            self.hits += 1
+            return row
+        self.misses += 1
+        return None, None
+
+    def invalidate(self):
+        with self._lock:
+            self._profiles = None
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._profiles or {}),
+        }
+
+
+# Shared by the recognition window and the profile editors
+profile_cache = ProfileCache()
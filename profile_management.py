@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
 import os
+from profile_cache import profile_cache
 
 DB_FILE = "profiles.db"
 
@@ -134,6 +135,7 @@ def open_profile_management(parent):
             """, (new_student_id, new_name, new_dept, pid))
             conn.commit()
             conn.close()
+            profile_cache.invalidate()
 
             load_profiles()
             show_message("info", "Updated", "Profile updated successfully.")
@@ -160,6 +162,7 @@ def open_profile_management(parent):
         cursor.execute("DELETE FROM profiles WHERE id=?", (pid,))
         conn.commit()
         conn.close()
+        profile_cache.invalidate()
 
         load_profiles()
         student_id_var.set("")
@@ -0,0 +1,85 @@
+import numpy as np
+from lbph_engine import elbp, spatial_histogram
+
+# --------------------- CONFIG ---------------------
+PROTOTYPES_PER_LABEL = 20   # samples kept per student after training (0 keeps all)
+MEDOID_ITERATIONS = 10
+
+
+# ----------------------------- DISTANCES -----------------------------
+def face_histograms(faces, radius=1, neighbors=8, grid_x=8, grid_y=8):
+    """LBPH spatial histograms of `faces`, identical to what train() stores."""
+    return np.stack([
+        spatial_histogram(elbp(face, radius, neighbors), 2 ** neighbors, grid_x, grid_y)
+        for face in faces
+    ])
+
+
+def pairwise_distances(histograms):
+    """
+    Squared Hellinger distances between all pairs of `histograms`.
+
+    Per bin, (a-b)^2/(a+b) lies between (sqrt(a)-sqrt(b))^2 and twice that,
+    so this ranks samples like LBPH's chi-square does, but reduces to one
+    matrix product instead of an element-wise pass per pair.
+    """
+    roots = np.sqrt(histograms.astype(np.float64))
+    norms = (roots * roots).sum(axis=1)
+    dist = norms[:, None] + norms[None, :] - 2 * (roots @ roots.T)
+    return np.maximum(dist, 0)
+
+
+# ----------------------------- K-MEDOIDS -----------------------------
+def k_medoids(dist, k, iterations=MEDOID_ITERATIONS, seed=0):
+    """
+    Indices (sorted) of up to `k` medoids given a pairwise distance matrix.
+
+    k-medoids++ seeding followed by alternating assignment / medoid update.
+    Medoids are always real samples, so the compacted model can be trained
+    from their face crops and keeps LBPH's exact histograms.
+    """
+    n = len(dist)
+    if n <= k:
+        return np.arange(n)
+
+    rng = np.random.default_rng(seed)
+    medoids = [int(rng.integers(n))]
+    closest = dist[medoids[0]].copy()
+    while len(medoids) < k and closest.sum() > 0:
+        medoids.append(int(rng.choice(n, p=closest / closest.sum())))
+        closest = np.minimum(closest, dist[medoids[-1]])
+
+    for _ in range(iterations):
+        assignment = dist[medoids].argmin(axis=0)
+        updated = []
+        for cluster in range(len(medoids)):
+            members = np.flatnonzero(assignment == cluster)
+            if len(members) == 0:
+                updated.append(medoids[cluster])
+                continue
+            within = dist[np.ix_(members, members)]
+            updated.append(int(members[within.sum(axis=1).argmin()]))
+        if updated == medoids:
+            break
+        medoids = updated
+    return np.sort(np.unique(medoids))
+
+
+def select_prototypes(faces, labels, per_label=PROTOTYPES_PER_LABEL, **lbph_params):
+    """
+    Return the indices of the samples to keep: `per_label` medoids for every
+    label, in the original sample order. per_label <= 0 keeps everything.
+    """
+    labels = np.asarray(labels)
+    if per_label <= 0:
+        return np.arange(len(labels))
+
+    keep = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        if len(members) <= per_label:
+            keep.append(members)
+            continue
+        histograms = face_histograms([faces[i] for i in members], **lbph_params)
+        keep.append(members[k_medoids(pairwise_distances(histograms), per_label)])
+    return np.sort(np.concatenate(keep))
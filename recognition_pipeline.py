@@ -0,0 +1,298 @@
+import threading
+import time
+from collections import deque
+
+# --------------------- CONFIG ---------------------
+STATS_WINDOW = 2.0      # seconds of history used for the FPS counters
+RESULT_TTL = 0.5        # drop recognition boxes older than this from the preview
+DROP_POLICIES = ("latest", "oldest")
+IDLE_AFTER = 5.0        # seconds without faces before recognition is throttled (0 = never)
+IDLE_RECOGNITION_HZ = 4 # frames per second offered to recognition while idle
+MIN_TICK_MS = 5         # render tick bounds; the minimum leaves Tk time for input events
+MAX_TICK_MS = 100
+DEFAULT_FRAME_MS = 33   # assumed camera interval until its rate is measured
+
+
+# ------------------ BOUNDED QUEUE ------------------
+class DropOldestQueue:
+    """
+    Bounded queue that never blocks the producer.
+    When full, the oldest item is discarded so consumers always see fresh frames.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        """Add `item`; returns the item dropped to make room, if any."""
+        dropped = None
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                dropped = self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+        return dropped
+
+    def get(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def drain(self):
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+# ------------------ STAGE COUNTERS ------------------
+class StageStats:
+    """Rolling frames-per-second counter for one pipeline stage."""
+
+    def __init__(self, name, window=STATS_WINDOW):
+        self.name = name
+        self.window = window
+        self.count = 0
+        self._stamps = deque()
+        self._lock = threading.Lock()
+
+    def tick(self):
+        now = time.perf_counter()
+        with self._lock:
+            self.count += 1
+            self._stamps.append(now)
+            while self._stamps[0] < now - self.window:
+                self._stamps.popleft()
+
+    @property
+    def fps(self):
+        with self._lock:
+            if len(self._stamps) < 2:
+                return 0.0
+            # Stale counters decay to zero once a stage stops producing
+            span = time.perf_counter() - self._stamps[0]
+            return (len(self._stamps) - 1) / span if span > 0 else 0.0
+
+
+# ------------------ PIPELINE ------------------
+class RecognitionPipeline:
+    """
+    Capture -> detection/recognition pool -> render.
+
+    A capture thread reads the camera as fast as it delivers frames and keeps
+    the newest one for the preview. While recognition is enabled every frame
+    is also offered to a bounded drop-oldest queue served by `workers`
+    threads running `process_frame(frame, seq)`. The render stage (the Tk loop)
+    calls `latest()` to get the newest frame plus the newest recognition
+    result, so the preview never waits for recognition, and `next_tick_ms()`
+    to schedule its next tick for when the camera delivers the next frame.
+
+    With `drop_policy` "latest" the queue holds a single frame and a new one
+    replaces it, so a slow pool always picks up the newest frame; "oldest"
+    keeps `queue_size` frames and drops the oldest. When no face has been
+    seen for `idle_after` seconds, only `idle_hz` frames per second are
+    offered to recognition until one is. An optional `motion_gate`
+    (motion_gate.MotionGate) holds back frames of a static scene; a
+    recognised face keeps it awake.
+
+    `process_frame` must be thread-safe; it returns the list of detected
+    faces drawn by the render stage, or None to discard the frame.
+    """
+
+    def __init__(self, cap, process_frame, workers=2, queue_size=2, drop_policy="latest",
+                 idle_after=IDLE_AFTER, idle_hz=IDLE_RECOGNITION_HZ, motion_gate=None):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}, not {drop_policy!r}")
+        self.cap = cap
+        self.process_frame = process_frame
+        self.workers = workers
+        self.drop_policy = drop_policy
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_hz
+        self.motion_gate = motion_gate
+        self.throttled = 0
+        self.frame_queue = DropOldestQueue(1 if drop_policy == "latest" else queue_size)
+        self.result_queue = DropOldestQueue(queue_size)
+        self.stats = {
+            "capture": StageStats("capture"),
+            "recognition": StageStats("recognition"),
+            "render": StageStats("render"),
+        }
+        self.recognition_enabled = threading.Event()
+
+        self._stop = threading.Event()
+        self._threads = []
+        self._frame_lock = threading.Lock()
+        self._frame_seq = 0
+        self._frame = None
+        self._frame_time = None
+        self._last_face = 0.0
+        self._last_offered = 0.0
+        self._rendered_seq = 0
+        self._result_seq = 0
+        self._result_time = 0.0
+        self._results = []
+
+    # ---------------- Lifecycle ----------------
+    def start(self):
+        capture = threading.Thread(target=self._capture_loop, name="capture", daemon=True)
+        capture.start()
+        self._threads.append(capture)
+        for i in range(self.workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"recognition-{i}", daemon=True)
+            worker.start()
+            self._threads.append(worker)
+
+    def stop(self):
+        self._stop.set()
+        self.frame_queue.close()
+        self.result_queue.close()
+        for t in self._threads:
+            t.join(timeout=2)
+        self._threads.clear()
+
+    def set_recognition(self, enabled):
+        if enabled:
+            # A new scan starts at full rate
+            self._last_face = time.perf_counter()
+            if self.motion_gate:
+                self.motion_gate.wake()
+            self.recognition_enabled.set()
+        else:
+            self.recognition_enabled.clear()
+            self.frame_queue.drain()
+            self.clear_results()
+
+    def clear_results(self):
+        self.result_queue.drain()
+        self._results = []
+
+    # ---------------- Stages ----------------
+    def _capture_loop(self):
+        while not self._stop.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            now = time.perf_counter()
+            with self._frame_lock:
+                self._frame_seq += 1
+                seq = self._frame_seq
+                self._frame = frame
+                self._frame_time = now
+            self.stats["capture"].tick()
+            if self.recognition_enabled.is_set() and self._offer(frame, now):
+                self.frame_queue.put((seq, frame))
+
+    def _offer(self, frame, now):
+        """Whether this frame goes to recognition, given the motion gate and idle throttle."""
+        if self.motion_gate and not self.motion_gate.check(frame):
+            return False
+        if self.idle and now - self._last_offered < self.idle_interval:
+            self.throttled += 1
+            return False
+        self._last_offered = now
+        return True
+
+    @property
+    def idle(self):
+        return bool(self.idle_after) and time.perf_counter() - self._last_face > self.idle_after
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            item = self.frame_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            seq, frame = item
+            try:
+                results = self.process_frame(frame, seq)
+            except Exception as e:
+                print(f"[ERROR] Recognition worker failed: {e}")
+                continue
+            if results is None:
+                continue
+            if results:
+                self._last_face = time.perf_counter()
+                if self.motion_gate:
+                    self.motion_gate.wake()
+            self.stats["recognition"].tick()
+            self.result_queue.put((seq, results))
+
+    def latest(self):
+        """
+        Return (frame, results) for the render stage, or (None, None) when no
+        new frame has arrived since the last call.
+        """
+        with self._frame_lock:
+            if self._frame_seq == self._rendered_seq:
+                return None, None
+            self._rendered_seq = self._frame_seq
+            frame = self._frame
+
+        # Workers may finish out of order; keep only the newest result
+        for seq, results in self.result_queue.drain():
+            if seq > self._result_seq:
+                self._result_seq = seq
+                self._result_time = time.perf_counter()
+                self._results = results
+        if self._results and time.perf_counter() - self._result_time > RESULT_TTL:
+            self._results = []
+
+        self.stats["render"].tick()
+        return frame, self._results
+
+    def next_tick_ms(self, rendered):
+        """
+        Delay until the render stage should call `latest()` again: just after
+        the camera's next frame is due, or soon when the expected frame had
+        not arrived yet (`rendered` False).
+        """
+        fps = self.stats["capture"].fps
+        interval = 1000.0 / fps if fps else DEFAULT_FRAME_MS
+        with self._frame_lock:
+            frame_time = self._frame_time
+        if not rendered or frame_time is None:
+            delay = interval / 4
+        else:
+            due = frame_time + interval / 1000.0
+            delay = (due - time.perf_counter()) * 1000.0 + 1
+        return int(min(MAX_TICK_MS, max(MIN_TICK_MS, delay)))
+
+    # ---------------- Metrics ----------------
+    def metrics(self):
+        return {
+            "capture_fps": self.stats["capture"].fps,
+            "recognition_fps": self.stats["recognition"].fps,
+            "render_fps": self.stats["render"].fps,
+            "frame_queue": len(self.frame_queue),
+            "frame_dropped": self.frame_queue.dropped,
+            "result_queue": len(self.result_queue),
+            "result_dropped": self.result_queue.dropped,
+            "throttled": self.throttled,
+            "idle": self.recognition_enabled.is_set() and self.idle,
+            "motion_skip": self.motion_gate.skip_ratio if self.motion_gate else 0.0,
+        }
+
+    def metrics_text(self):
+        m = self.metrics()
+        return (f"Capture {m['capture_fps']:.1f} fps | "
+                f"Recognition {m['recognition_fps']:.1f} fps{' (idle)' if m['idle'] else ''} "
+                f"(queue {m['frame_queue']}, dropped {m['frame_dropped']}, throttled {m['throttled']}, "
+                f"motion skip {m['motion_skip']:.0%}) | "
+                f"Effective {m['render_fps']:.1f} fps")
@@ -0,0 +1,138 @@
+import threading
+import time
+import cv2
+import numpy as np
+from profile_cache import profile_cache
+from lbph_engine import LBPHEngine
+from model_manager import model_manager
+from face_tracking import DETECT_EVERY, RECOGNIZE_EVERY, FaceTracker
+from face_detector import FaceDetector
+
+# --------------------- CONFIG ---------------------
+CONFIDENCE_THRESHOLD = 70
+SMOOTHING_FRAMES = 15
+COOLDOWN = 10
+TRACKING_MODE = True      # detect every few frames, track faces in between
+
+
+class RecognitionSession:
+    """
+    Detection, tracking, recognition and attendance cooldown for one camera.
+
+    `process(frame, seq)` returns the faces to draw as
+    (x, y, w, h, name, student_id, department) tuples, or None for a stale
+    frame. When a student is recognised and their cooldown has passed,
+    `on_recognized(name, student_id, department)` is called; the Tk window
+    logs and unlocks the door from it, the multi-camera workers forward it
+    to the parent process.
+
+    Safe to call from several pipeline workers at once: tracker and
+    cooldown state are locked, the Haar cascade and LBPH run outside the
+    locks, so workers detect and recognise in parallel.
+    """
+
+    def __init__(self, on_recognized, tracking=TRACKING_MODE):
+        self.on_recognized = on_recognized
+        self.last_seen = 0.0      # time a known student was last in view
+        self._last_logged = {}
+        self._log_lock = threading.Lock()
+        # CascadeClassifier is not thread-safe, so every worker gets its own,
+        # along with its own gray frame buffer
+        self._detectors = threading.local()
+        # Tracks persist between frames, so workers take turns updating them
+        self.tracker = FaceTracker(self._detect,
+                                   detect_every=DETECT_EVERY if tracking else 1,
+                                   recognize_every=RECOGNIZE_EVERY if tracking else 1,
+                                   smoothing=SMOOTHING_FRAMES)
+        self._tracker_lock = threading.Lock()
+
+    def _detect(self, gray):
+        # Runs on a downscaled frame; boxes come back in full-frame coordinates
+        if not hasattr(self._detectors, "face"):
+            self._detectors.face = FaceDetector()
+        return self._detectors.face.detect(gray)
+
+    def _gray(self, frame):
+        """Equalised gray copy of `frame` in this worker's reused buffer."""
+        height, width = frame.shape[:2]
+        buffer = getattr(self._detectors, "gray", None)
+        if buffer is None or buffer.shape != (height, width):
+            buffer = self._detectors.gray = np.empty((height, width), np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buffer)
+        return cv2.equalizeHist(buffer, dst=buffer)
+
+    def reset(self):
+        self.last_seen = 0.0
+        with self._tracker_lock:
+            self.tracker.reset()
+
+    def stats(self):
+        return self.tracker.stats()
+
+    # ---------------- Per Frame ----------------
+    def process(self, frame, seq=None):
+        # A newer frame already started; skip the conversion (rechecked under the lock)
+        if self.tracker.stale(seq):
+            return None
+        model = model_manager.get()
+        # Only read during this call: the tracker keeps copies, the crops are resized
+        gray = self._gray(frame)
+
+        with self._tracker_lock:
+            step = self.tracker.begin(gray, seq)
+        if step is None:
+            return None
+        detections = self._detect(gray) if step.detect else None
+        with self._tracker_lock:
+            tracks = self.tracker.finish(step, detections)
+            if tracks is None:
+                return None
+            boxes = [(track, track.box) for track in tracks]
+            pending = self.tracker.due_for_recognition()
+
+        # Only new tracks and tracks due for a re-check go through the recognizer
+        face_rois = []
+        for track in pending:
+            x, y, w, h = track.box
+            face_roi = cv2.resize(gray[y:y+h, x:x+w], (200,200))
+            face_rois.append(cv2.equalizeHist(face_roi, dst=face_roi))
+
+        if isinstance(model, LBPHEngine):
+            predictions = model.predict_batch(face_rois)
+        else:
+            predictions = [model.predict(face_roi) for face_roi in face_rois]
+
+        for track, (id_, confidence) in zip(pending, predictions):
+            # Each face votes only on its own track's identity
+            with self._tracker_lock:
+                final_id = track.votes.push(id_ if confidence < CONFIDENCE_THRESHOLD else "Unknown")
+
+            identity = None
+            if final_id != "Unknown":
+                name, dept = profile_cache.get(final_id)
+                if name:
+                    identity = (name, final_id, dept)
+                    model_manager.recognized()
+                    self._log(name, final_id, dept)
+            with self._tracker_lock:
+                self.tracker.mark_recognized(track, identity)
+
+        detected_faces = []
+        for track, (x, y, w, h) in boxes:
+            if track.identity:
+                name, student_id, dept = track.identity
+                detected_faces.append((x, y, w, h, name, student_id, dept))
+                self.last_seen = time.time()
+            else:
+                detected_faces.append((x, y, w, h, "Unknown", "", ""))
+        return detected_faces
+
+    def _log(self, name, student_id, dept):
+        now = time.time()
+        with self._log_lock:
+            last = self._last_logged.get(student_id)
+            should_log = last is None or now - last > COOLDOWN
+            if should_log:
+                self._last_logged[student_id] = now
+        if should_log:
+            self.on_recognized(name, student_id, dept)
@@ -0,0 +1,324 @@
+import queue
+import threading
+import time
+import serial
+from recognition_pipeline import DropOldestQueue
+from settings_interface import load_settings
+
+# --------------------- CONFIG ---------------------
+# Port and baud rate come from settings.json ("arduino_port", "arduino_baud");
+# any pyserial URL works as the port too: "loop://", "/dev/pts/5" (arduino_sim.py)
+ARDUINO_PORT = "COM3"
+BAUD_RATE = 9600
+RESET_DELAY = 2.0         # the Arduino reboots when the port opens
+READ_TIMEOUT = 0.5        # readline() returns at a newline at once; the timeout only bounds shutdown
+WRITE_TIMEOUT = 1.0       # a stalled port fails the write instead of hanging the writer
+RECONNECT_DELAY = 2.0
+OUTBOUND_QUEUE_SIZE = 16  # pending commands; the oldest is dropped when full
+# Seconds a command may wait for the port before it is discarded; a door
+# unlock that arrives after the student has left must never fire
+COMMAND_TTL = {"OPEN": 5.0}
+EVENTS = ("PERSON_DETECTED", "SCAN", "CLEAR")
+
+
+class Command:
+    """
+    One queued command line and its write acknowledgement.
+
+    `wait()` blocks until the writer has written it to the port (True) or
+    given up on it (False, with the reason in `error`). `latency` is the
+    time from send() to the completed write. A command still unwritten
+    `ttl` seconds after send() (default: COMMAND_TTL for its kind, else
+    never) fails as "expired".
+    """
+
+    def __init__(self, text, ttl=None):
+        self.text = text
+        self.queued_at = time.perf_counter()
+        if ttl is None:
+            ttl = COMMAND_TTL.get(self.kind)
+        self.expires_at = None if ttl is None else self.queued_at + ttl
+        self.latency = None
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def kind(self):
+        return self.text.split("|", 1)[0]
+
+    @property
+    def expired(self):
+        return self.expires_at is not None and time.perf_counter() >= self.expires_at
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout) and self.error is None
+
+    def _finish(self, error=None):
+        self.error = error
+        if error is None:
+            self.latency = time.perf_counter() - self.queued_at
+        self._done.set()
+
+
+class SerialLink:
+    """
+    Arduino serial link run by a reader and a writer thread.
+
+    The reader opens the port (reopening it after errors) and blocks in
+    readline(), so a line is handed over as soon as its newline arrives.
+    Known EVENTS go to `events`, which the Tk loop drains with `poll()`;
+    nothing is called on the reader thread. `send()` only queues a
+    command for the writer, so a slow or stalled port never blocks the
+    frame loop; commands queued while the port is down wait for it to
+    (re)open, the oldest dropped first once OUTBOUND_QUEUE_SIZE are waiting,
+    and kinds listed in COMMAND_TTL (OPEN) expire instead of being written
+    late.
+    Each send() returns a Command acknowledged once written, and write
+    latency is kept per command kind (OPEN, ...).
+
+    Use `get_link()` rather than constructing one: the door and the
+    recognition window must share the port, which only one handle can hold.
+    """
+
+    def __init__(self, url=ARDUINO_PORT, baud=BAUD_RATE, reset_delay=RESET_DELAY):
+        self.url = url
+        self.baud = baud
+        self.reset_delay = reset_delay
+        self.events = queue.Queue()
+        self.received = 0
+        self.sent = 0
+        self.errors = 0
+        self.expired = 0
+        self.last_latency = None
+        self._latencies = {}     # kind -> [count, total, max]; constant size however long it runs
+        self._outbound = DropOldestQueue(OUTBOUND_QUEUE_SIZE)
+        self._port = None
+        self._port_lock = threading.Lock()
+        self._open_failed = False
+        self._connected = threading.Event()
+        self._stop = threading.Event()
+        self._threads = {}
+
+    # ---------------- Lifecycle ----------------
+    def start(self):
+        """
+        Open the port in the background; safe to call again. Each thread is
+        checked on its own, so get_link() restarts whichever one has died.
+        """
+        self._stop.clear()
+        for name, target in (("serial-reader", self._read_loop), ("serial-writer", self._write_loop)):
+            thread = self._threads.get(name)
+            if thread is not None and thread.is_alive():
+                continue
+            if thread is not None:
+                print(f"[ERROR] Arduino {name} thread had stopped, restarting it")
+            thread = self._threads[name] = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._outbound.close()
+        # Both threads wake within READ_TIMEOUT
+        for t in self._threads.values():
+            t.join(timeout=2)
+        self._threads = {}
+        # A closed queue never blocks; a later start() needs a fresh one
+        self._outbound = DropOldestQueue(OUTBOUND_QUEUE_SIZE)
+
+    @property
+    def connected(self):
+        return self._connected.is_set()
+
+    # ---------------- Producer / Consumer ----------------
+    def send(self, text, ttl=None):
+        """
+        Queue one command line (without newline); never blocks. Returns its
+        Command. `ttl` defaults to the COMMAND_TTL entry for its kind.
+        """
+        command = Command(text, ttl)
+        dropped = self._outbound.put(command)
+        if dropped is not None:
+            dropped._finish("dropped: outbound queue full")
+        return command
+
+    def poll(self):
+        """Events received since the last call, oldest first."""
+        events = []
+        while True:
+            try:
+                message, received_at = self.events.get_nowait()
+            except queue.Empty:
+                break
+            self.last_latency = time.perf_counter() - received_at
+            events.append(message)
+        return events
+
+    # ---------------- Threads ----------------
+    def _open(self):
+        try:
+            port = serial.serial_for_url(self.url, self.baud, timeout=READ_TIMEOUT,
+                                         write_timeout=WRITE_TIMEOUT)
+        except (serial.SerialException, ValueError) as e:
+            # Reported once, not on every retry
+            if not self._open_failed:
+                print(f"[ERROR] Could not open Arduino port {self.url}: {e}")
+            self._open_failed = True
+            return None
+        self._open_failed = False
+        # Published at once so _close() owns it even if the reset below fails
+        with self._port_lock:
+            self._port = port
+        if self.reset_delay and self._stop.wait(self.reset_delay):
+            return None
+        port.reset_input_buffer()
+        with self._port_lock:
+            self._connected.set()
+        print(f"[INFO] Arduino connected on {self.url}")
+        return port
+
+    def _close(self):
+        # Under the lock the writer holds while writing, so the port is never
+        # closed underneath a write
+        with self._port_lock:
+            port, self._port = self._port, None
+            self._connected.clear()
+            if port is not None:
+                try:
+                    port.close()
+                except Exception:
+                    pass
+
+    def _read_loop(self):
+        while not self._stop.is_set():
+            try:
+                port = self._open()
+                if port is not None:
+                    self._read_lines(port)
+            except Exception as e:
+                # Not only SerialException: pyserial raises TypeError and the
+                # like from a port torn down mid-call, and this thread must outlive it
+                if not self._stop.is_set():
+                    self.errors += 1
+                    print(f"[ERROR] Arduino link lost: {e!r}")
+            finally:
+                self._close()
+            self._stop.wait(RECONNECT_DELAY)
+
+    def _read_lines(self, port):
+        partial = b""
+        while not self._stop.is_set():
+            line = port.readline()
+            if not line.endswith(b"\n"):
+                # Timed out mid-line (or nothing came); keep what arrived
+                partial += line
+                continue
+            message = (partial + line).decode(errors="replace").strip()
+            partial = b""
+            if message in EVENTS:
+                self.received += 1
+                self.events.put((message, time.perf_counter()))
+
+    def _write_loop(self):
+        while not self._stop.is_set():
+            command = None
+            try:
+                command = self._outbound.get(timeout=READ_TIMEOUT)
+                if command is not None:
+                    self._deliver(command)
+            except Exception as e:
+                # Whatever goes wrong with one command, the writer keeps going
+                self.errors += 1
+                print(f"[ERROR] Arduino writer: {e!r}")
+                if command is not None and not command.done:
+                    command._finish(repr(e))
+        # Commands still queued at shutdown are never written
+        for command in self._outbound.drain():
+            command._finish("link stopped")
+
+    def _deliver(self, command):
+        """Write `command` once the reader has the port open; finishes it either way."""
+        while True:
+            if self._stop.is_set():
+                command._finish("link stopped")
+                return
+            if command.expired:
+                self._expire(command)
+                return
+            # Held until the reader has the port open, or it expires
+            if not self._connected.wait(READ_TIMEOUT):
+                continue
+            with self._port_lock:
+                port = self._port
+                if port is None or not self._connected.is_set():
+                    # Lost between the wait and the lock; wait for the reconnect
+                    continue
+                try:
+                    # write() returns once the bytes are with the OS and is bounded
+                    # by WRITE_TIMEOUT; flush() (tcdrain) has no timeout at all
+                    port.write((command.text + "\n").encode())
+                except Exception as e:
+                    self.errors += 1
+                    command._finish(str(e) or repr(e))
+                    print(f"[ERROR] Could not send command to Arduino: {e!r}")
+                    return
+            command._finish()
+            self.sent += 1
+            self._record(command)
+            print(f"[ARDUINO] Sent: {command.text} ({command.latency * 1000:.1f} ms)")
+            return
+
+    def _expire(self, command):
+        self.expired += 1
+        command._finish("expired")
+        print(f"[ARDUINO] Discarded stale command: {command.text}")
+
+    def _record(self, command):
+        entry = self._latencies.setdefault(command.kind, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += command.latency
+        entry[2] = max(entry[2], command.latency)
+
+    def command_latencies(self):
+        """{kind: (count, mean, max)} write latency in seconds per command kind."""
+        return {kind: (count, total / count, longest)
+                for kind, (count, total, longest) in list(self._latencies.items())}
+
+    def stats(self):
+        return {
+            "connected": self.connected,
+            "received": self.received,
+            "sent": self.sent,
+            "dropped": self._outbound.dropped,
+            "errors": self.errors,
+            "expired": self.expired,
+            "last_latency": self.last_latency,
+            "commands": self.command_latencies(),
+        }
+
+
+# ------------------ SHARED LINKS ------------------
+_links = {}
+_links_lock = threading.Lock()
+
+
+def get_link(url=None, baud=None):
+    """
+    The shared, started link for `url` (default: "arduino_port" in
+    settings.json). The port is opened in the background on first use,
+    not at import: main.py imports the recognition window, and so does
+    every spawned training worker process.
+    """
+    if url is None or baud is None:
+        settings = load_settings()
+        url = url or settings.get("arduino_port", ARDUINO_PORT)
+        baud = baud or int(settings.get("arduino_baud", BAUD_RATE))
+    with _links_lock:
+        link = _links.get(url)
+        if link is None:
+            link = _links[url] = SerialLink(url, baud)
+        link.start()
+    return link
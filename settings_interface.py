@@ -16,9 +16,32 @@ def load_settings():
         "camera_source": "0",
         "threshold": 0.6,
         "model_path": "models/",
-        "attendance_log_path": "attendance_logs/"
+        "attendance_log_path": "attendance_logs/",
+        "arduino_port": "COM3",
+        "arduino_baud": 9600
     }
 
+# -----------------------------
+# Camera Sources
+# -----------------------------
+def camera_sources(settings=None):
+    """
+    The cameras listed in settings as VideoCapture sources.
+    "camera_source" may be a list or a comma-separated string such as
+    "0, 1, rtsp://door-2/stream"; device numbers become ints.
+    """
+    if settings is None:
+        settings = load_settings()
+    value = settings.get("camera_source", "0")
+    if not isinstance(value, list):
+        value = str(value).split(",")
+    sources = []
+    for source in value:
+        source = str(source).strip()
+        if source:
+            sources.append(int(source) if source.isdigit() else source)
+    return sources or [0]
+
 # -----------------------------
 # Save Settings
 # -----------------------------
@@ -60,9 +83,12 @@ def open_settings_interface():
     # -----------------------------
     frame_camera = tk.Frame(win, bg="#f0f0f0")
     frame_camera.pack(pady=10, fill=tk.X, padx=30)
-    tk.Label(frame_camera, text="Camera Source (0 for default):",
+    tk.Label(frame_camera, text="Camera Sources (0 for default, comma-separated):",
              font=("Arial", 12), bg="#f0f0f0").grid(row=0, column=0, sticky="w")
-    camera_var = tk.StringVar(value=settings["camera_source"])
+    camera_source = settings["camera_source"]
+    if isinstance(camera_source, list):
+        camera_source = ", ".join(str(source) for source in camera_source)
+    camera_var = tk.StringVar(value=camera_source)
     tk.Entry(frame_camera, textvariable=camera_var, font=("Arial", 12), width=25).grid(row=0, column=1, padx=10)
 
     # -----------------------------
@@ -103,12 +129,14 @@ def open_settings_interface():
     # Save Button
     # -----------------------------
     def save_changes():
-        new_settings = {
+        # Keep keys this window does not edit
+        new_settings = dict(settings)
+        new_settings.update({
             "camera_source": camera_var.get(),
             "threshold": threshold_var.get(),
             "model_path": model_var.get(),
             "attendance_log_path": log_var.get()
-        }
+        })
         save_settings(new_settings, parent=win)  # attach messagebox to this window
 
     tk.Button(win, text="Save Settings", command=save_changes,
@@ -0,0 +1,73 @@
+"""
+mark_absent_for_past_days() against a throwaway attendance.db.
+
+    python -m pytest -q tests
+"""
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import check_attendance
+from check_attendance import init_db, mark_absent_for_past_days
+
+
+def absences(db):
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT student_id, date FROM attendance_records WHERE status = 'Absent'").fetchall()
+    conn.close()
+    return sorted(rows)
+
+
+def add_student(db, student_id):
+    conn = sqlite3.connect(db)
+    conn.execute("INSERT INTO students (name, student_id, department) VALUES (?, ?, 'CS')",
+                 (f"Student {student_id}", student_id))
+    conn.commit()
+    conn.close()
+
+
+def add_present(db, student_id, date):
+    conn = sqlite3.connect(db)
+    conn.execute("INSERT INTO attendance_records (name, student_id, department, date, time, status) "
+                 "VALUES (?, ?, 'CS', ?, '09:00:00', 'Present')", (f"Student {student_id}", student_id, date))
+    conn.commit()
+    conn.close()
+
+
+def test_student_added_after_backfill_gets_past_absences(tmp_path, monkeypatch):
+    db = str(tmp_path / "attendance.db")
+    monkeypatch.setattr(check_attendance, "DB_FILE", db)
+    init_db()
+    add_student(db, "1")
+    add_student(db, "2")
+    add_present(db, "1", "2024-01-01")
+    add_present(db, "2", "2024-01-02")
+
+    mark_absent_for_past_days()
+    assert absences(db) == [("1", "2024-01-02"), ("2", "2024-01-01")]
+
+    # Added after both dates were filled in; the old per-student loop gave them both
+    add_student(db, "3")
+    mark_absent_for_past_days()
+    assert absences(db) == [("1", "2024-01-02"), ("2", "2024-01-01"),
+                            ("3", "2024-01-01"), ("3", "2024-01-02")]
+
+    # Nothing new: a second run adds nothing
+    mark_absent_for_past_days()
+    assert len(absences(db)) == 4
+
+
+def test_new_dates_are_filled_for_everyone(tmp_path, monkeypatch):
+    db = str(tmp_path / "attendance.db")
+    monkeypatch.setattr(check_attendance, "DB_FILE", db)
+    init_db()
+    add_student(db, "1")
+    add_student(db, "2")
+    add_present(db, "1", "2024-01-01")
+    mark_absent_for_past_days()
+
+    add_present(db, "2", "2024-01-03")
+    mark_absent_for_past_days()
+    assert absences(db) == [("1", "2024-01-03"), ("2", "2024-01-01")]
@@ -1,10 +1,14 @@
 import os
 import cv2
 import numpy as np
-from PIL import Image
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from threading import Thread
+from training_data import ingest_images, list_dataset, list_profile_folders
+from face_cache import FaceCache
+from incremental_training import load_state, plan_training, save_state
+from prototypes import PROTOTYPES_PER_LABEL, select_prototypes
+from model_store import MODEL_BIN, save_recognizer, save_yml
 
 MODEL_FILE = "trainer.yml"
 DATASET_DIR = os.getcwd()  # all profile folders are in current working directory
@@ -27,11 +31,15 @@ def open_train_model_interface():
     frame.place(relx=0.5, rely=0.52, anchor="center", width=900, height=500)
 
     desc = tk.Label(frame, text=(
-        "All profiles will be retrained together every time training is started.\n"
+        "New images are added to the existing model; deleting or editing a profile retrains all of them.\n"
         "Model accuracy has been improved with preprocessing for distance and lighting."
     ),
     font=("Arial", 14), bg="white", justify="center", fg="#333")
-    desc.pack(pady=40)
+    desc.pack(pady=(40, 10))
+
+    incremental_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(frame, text="Incremental update (only train new images)",
+                   variable=incremental_var, font=("Arial", 12), bg="white").pack()
 
     progress_label = tk.Label(frame, text="Training Progress:",
                               font=("Arial", 14, "bold"), bg="white")
@@ -96,12 +104,7 @@ def open_train_model_interface():
 
         def refresh_profiles():
             list_box.delete(0, tk.END)
-            profile_folders = [
-                f for f in os.listdir(DATASET_DIR)
-                if os.path.isdir(os.path.join(DATASET_DIR, f))
-                and any(img.lower().endswith(('.jpg', '.jpeg', '.png'))
-                        for img in os.listdir(os.path.join(DATASET_DIR, f)))
-            ]
+            profile_folders = list_profile_folders(DATASET_DIR)
             for folder in profile_folders:
                 list_box.insert(tk.END, f"{folder}  - Ready")
                 list_box.itemconfig(tk.END, fg="green")
@@ -112,26 +115,6 @@ def open_train_model_interface():
 
         refresh_profiles()
 
-    # ----------------------------- FACE PREPROCESSING -----------------------------
-    def preprocess_face(img):
-        # Equalize histogram (lighting correction)
-        img = cv2.equalizeHist(img)
-
-        # Reduce noise
-        img = cv2.GaussianBlur(img, (3, 3), 0)
-
-        # Resize to standard LBPH size
-        img = cv2.resize(img, (200, 200))
-
-        return img
-
-    # ----------------------------- LABEL EXTRACTOR -----------------------------
-    def extract_label(folder_name):
-        digits = ''.join(filter(str.isdigit, folder_name))
-        if digits.isdigit():
-            return int(digits)
-        return abs(hash(folder_name)) % 10000
-
     # ----------------------------- MAIN TRAINING FUNCTION -----------------------------
     def train_model():
         nonlocal stop_flag, log_messages
@@ -141,71 +124,61 @@ def open_train_model_interface():
         recognizer = cv2.face.LBPHFaceRecognizer_create(radius=1, neighbors=8,
                                                         grid_x=8, grid_y=8)
 
-        detector = cv2.CascadeClassifier(cv2.data.haarcascades +
-                                         "haarcascade_frontalface_default.xml")
-
         # Collect folders
-        folders = [
-            f for f in os.listdir(DATASET_DIR)
-            if os.path.isdir(os.path.join(DATASET_DIR, f))
-            and any(img.lower().endswith(('.jpg', '.jpeg', '.png'))
-                    for img in os.listdir(os.path.join(DATASET_DIR, f)))
-        ]
+        folders = list_profile_folders(DATASET_DIR)
 
         if not folders:
             status_label.config(text="No training folders found!")
             return
 
-        total_images = sum(
-            len([img for img in os.listdir(os.path.join(DATASET_DIR, f))
-                 if img.lower().endswith(('.jpg', '.jpeg', '.png'))])
-            for f in folders
-        )
+        dataset = list_dataset(DATASET_DIR, folders)
 
-        progress["maximum"] = total_images
+        progress["maximum"] = len(dataset)
         progress["value"] = 0
 
-        face_samples, ids = [], []
+        face_samples, ids, sample_paths = [], [], []
 
         log_messages.append(f"🔹 Training {len(folders)} profiles...")
 
         # ----------------------------- Collect Images -----------------------------
-        for folder in folders:
-            folder_path = os.path.join(DATASET_DIR, folder)
-            label = extract_label(folder)
-
-            for img_name in os.listdir(folder_path):
-                if stop_flag: return
-
-                if not img_name.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    continue
-
-                img_path = os.path.join(folder_path, img_name)
-                try:
-                    pil_img = Image.open(img_path).convert('L')
-                except:
-                    log_messages.append(f"⚠️ Skipped corrupted file: {img_name}")
-                    continue
-
-                img_np = np.array(pil_img, 'uint8')
-
-                # Detect faces, allow small faces for distance variation
-                faces = detector.detectMultiScale(img_np, scaleFactor=1.1, minNeighbors=5, minSize=(40, 40))
-
-                if len(faces) == 0:
-                    log_messages.append(f"❌ No face detected in {img_name}")
-                else:
-                    for (x, y, w, h) in faces:
-                        face = img_np[y:y+h, x:x+w]
-                        face = preprocess_face(face)
-
-                        face_samples.append(face)
-                        ids.append(label)
-                        log_messages.append(f"✅ Face added from {img_name}")
-                        break  # Only one face per image
-
-                progress["value"] += 1
-                window.update_idletasks()
+        # Unchanged images come straight from the face cache; the rest fan out
+        # over a process pool. Both are merged back in dataset order so
+        # face_samples/ids are deterministic.
+        cache = FaceCache()
+        cached = [cache.lookup(img_path) for _, img_path in dataset]
+        misses = [img_path for (_, img_path), hit in zip(dataset, cached) if hit is None]
+        log_messages.append(f"🔹 Face cache: {cache.hits}/{len(dataset)} images cached "
+                            f"({cache.hit_rate:.0%} hit rate), {len(misses)} to process")
+        fresh = ingest_images(misses, should_stop=lambda: stop_flag)
+
+        for (label, img_path), hit in zip(dataset, cached):
+            if stop_flag:
+                return
+            if hit is None:
+                result = next(fresh, None)
+                if result is None:
+                    return
+                _, status, face = result
+                cache.store(img_path, status, face)
+            else:
+                status, face = hit
+            img_name = os.path.basename(img_path)
+            if status == "corrupt":
+                log_messages.append(f"⚠️ Skipped corrupted file: {img_name}")
+                continue
+
+            if status == "no_face":
+                log_messages.append(f"❌ No face detected in {img_name}")
+            else:
+                face_samples.append(face)
+                ids.append(label)
+                sample_paths.append(img_path)
+                log_messages.append(f"✅ Face added from {img_name}")
+
+            progress["value"] += 1
+            window.update_idletasks()
+
+        cache.save()
 
         if not face_samples:
             status_label.config(text="Training failed: No valid faces!")
@@ -213,14 +186,50 @@ def open_train_model_interface():
             return
 
         # ----------------------------- Train Model -----------------------------
-        status_label.config(text="Training model...")
-        log_messages.append("🔹 Training LBPH model...")
+        current = {path: [cache.fingerprint(path), label] for path, label in zip(sample_paths, ids)}
+        mode, new_paths, reason = "full", list(current), "full retrain requested"
+        if incremental_var.get() and os.path.exists(MODEL_FILE):
+            mode, new_paths, reason = plan_training(load_state(), current, PROTOTYPES_PER_LABEL)
+
+        if mode == "noop":
+            status_label.config(text="✅ Model already up to date.")
+            log_messages.append(f"✅ Nothing to train: {reason}")
+            return
 
-        recognizer.train(face_samples, np.array(ids))
-        recognizer.save(MODEL_FILE)
+        if mode == "update":
+            status_label.config(text="Updating model...")
+            log_messages.append(f"🔹 Incremental LBPH update: {reason}")
+            index = {path: i for i, path in enumerate(sample_paths)}
+            new = [index[path] for path in new_paths]
+        else:
+            new = list(range(len(face_samples)))
+
+        # Near-duplicate video frames add size and predict() time but little
+        # accuracy: keep PROTOTYPES_PER_LABEL representative samples per student
+        if PROTOTYPES_PER_LABEL:
+            status_label.config(text="Selecting prototypes...")
+            keep = select_prototypes([face_samples[i] for i in new], [ids[i] for i in new],
+                                     PROTOTYPES_PER_LABEL)
+            log_messages.append(f"🔹 Compacted {len(new)} samples to {len(keep)} prototypes "
+                                f"({PROTOTYPES_PER_LABEL} per profile)")
+            new = [new[i] for i in keep]
+
+        if mode == "update":
+            recognizer.read(MODEL_FILE)
+            recognizer.update([face_samples[i] for i in new], np.array([ids[i] for i in new]))
+        else:
+            status_label.config(text="Training model...")
+            log_messages.append(f"🔹 Training LBPH model ({reason})...")
+            recognizer.train([face_samples[i] for i in new], np.array([ids[i] for i in new]))
+
+        # Both files are renamed into place; the binary model goes last since
+        # that is the one a running recognition window watches and reloads
+        save_yml(recognizer, MODEL_FILE)
+        save_recognizer(recognizer, MODEL_BIN)
+        save_state(current, PROTOTYPES_PER_LABEL)
 
         status_label.config(text="✅ Training completed successfully!")
-        log_messages.append("✅ Model saved as trainer.yml")
+        log_messages.append(f"✅ Model saved as {MODEL_FILE} and {MODEL_BIN}")
 
     # ----------------------------- Stop Training -----------------------------
     def stop_training():
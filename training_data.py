@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from PIL import Image
+
+# --------------------- CONFIG ---------------------
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+FACE_SIZE = (200, 200)
+INGEST_WORKERS = os.cpu_count() or 1
+
+# Per-process detector, created by init_worker()
+_detector = None
+
+
+# ----------------------------- FACE PREPROCESSING -----------------------------
+def preprocess_face(img):
+    # Equalize histogram (lighting correction)
+    img = cv2.equalizeHist(img)
+
+    # Reduce noise
+    img = cv2.GaussianBlur(img, (3, 3), 0)
+
+    # Resize to standard LBPH size
+    img = cv2.resize(img, FACE_SIZE)
+
+    return img
+
+
+# ----------------------------- LABEL EXTRACTOR -----------------------------
+def extract_label(folder_name):
+    digits = ''.join(filter(str.isdigit, folder_name))
+    if digits.isdigit():
+        return int(digits)
+    return abs(hash(folder_name)) % 10000
+
+
+# ----------------------------- DATASET LISTING -----------------------------
+def is_image(filename):
+    return filename.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def list_profile_folders(dataset_dir):
+    return [
+        f for f in os.listdir(dataset_dir)
+        if os.path.isdir(os.path.join(dataset_dir, f))
+        and any(is_image(img) for img in os.listdir(os.path.join(dataset_dir, f)))
+    ]
+
+
+def list_dataset(dataset_dir, folders):
+    """Return [(label, img_path)] in folder, then directory-listing order."""
+    items = []
+    for folder in folders:
+        folder_path = os.path.join(dataset_dir, folder)
+        label = extract_label(folder)
+        for img_name in os.listdir(folder_path):
+            if is_image(img_name):
+                items.append((label, os.path.join(folder_path, img_name)))
+    return items
+
+
+# ----------------------------- INGESTION -----------------------------
+def init_worker():
+    global _detector
+    # One OpenCV thread per process; the pool already uses every core
+    cv2.setNumThreads(1)
+    _detector = cv2.CascadeClassifier(cv2.data.haarcascades +
+                                      "haarcascade_frontalface_default.xml")
+
+
+def load_face_sample(img_path):
+    """
+    Decode one image and return (status, face) where status is "ok",
+    "no_face" or "corrupt" and face is the preprocessed 200x200 uint8 crop.
+    """
+    if _detector is None:
+        init_worker()
+    try:
+        pil_img = Image.open(img_path).convert('L')
+    except Exception:
+        return "corrupt", None
+
+    img_np = np.array(pil_img, 'uint8')
+
+    # Detect faces, allow small faces for distance variation
+    faces = _detector.detectMultiScale(img_np, scaleFactor=1.1, minNeighbors=5, minSize=(40, 40))
+    if len(faces) == 0:
+        return "no_face", None
+
+    # Only one face per image
+    x, y, w, h = faces[0]
+    return "ok", preprocess_face(img_np[y:y+h, x:x+w])
+
+
+def ingest_images(paths, workers=INGEST_WORKERS, should_stop=None):
+    """
+    Run load_face_sample over `paths` on a process pool.
+    Yields (path, status, face) in the same order as `paths`, so the
+    resulting samples are identical to a serial run.
+    """
+    if not paths:
+        return
+    workers = max(1, min(workers, len(paths)))
+    chunksize = max(1, min(32, len(paths) // (workers * 4)))
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+    try:
+        for path, (status, face) in zip(paths, executor.map(load_face_sample, paths, chunksize=chunksize)):
+            if should_stop and should_stop():
+                return
+            yield path, status, face
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)